@@ -0,0 +1,120 @@
+// Jupyter notebook embeds
+// generate_docs.py emits a small <div class="jupyter-notebook-embed" data-...> per notebook;
+// the action buttons, tip and nbviewer preview are built here at load time.
+(() => {
+  const GITHUB_ORG = 'comphy-lab';
+
+  const createElement = (tag, className, html) => {
+    const element = document.createElement(tag);
+    if (className) {
+      element.className = className;
+    }
+    if (html) {
+      element.innerHTML = html;
+    }
+    return element;
+  };
+
+  const createButton = (href, className, icon, label) => {
+    const button = createElement('a', `notebook-btn ${className}`, `<i class="fa-solid ${icon}"></i> `);
+    button.href = href;
+    button.appendChild(document.createTextNode(label));
+    return button;
+  };
+
+  const handleIframeError = (id) => {
+    const iframe = document.getElementById('notebook-iframe-' + id);
+    const errorDiv = document.getElementById('notebook-error-' + id);
+
+    if (iframe && errorDiv) {
+      iframe.style.display = 'none';
+      errorDiv.style.display = 'block';
+    }
+  };
+
+  const checkIframeLoaded = (id) => {
+    try {
+      const iframe = document.getElementById('notebook-iframe-' + id);
+      const iframeContent = iframe.contentWindow || iframe.contentDocument;
+      try {
+        if (iframeContent.document.title.includes('404') ||
+            iframeContent.document.body.textContent.includes('404 Not Found')) {
+          handleIframeError(id);
+        }
+      } catch (e) {}
+    } catch (e) {
+      handleIframeError(id);
+    }
+  };
+
+  const buildEmbed = (container) => {
+    const { nb, nbPath, repo, title } = container.dataset;
+    const id = nb.replace(/\./g, '-');
+    const blobUrl = `${GITHUB_ORG}/${repo}/blob/main/${nbPath}`;
+    const nbviewerUrl = `https://nbviewer.org/github/${blobUrl}`;
+
+    // Heading and action buttons go before the server-rendered description
+    const heading = createElement('h2');
+    heading.textContent = `Jupyter Notebook: ${title}`;
+
+    const buttons = createElement('div', 'notebook-action-buttons');
+    const download = createButton(nb, 'download-btn', 'fa-download', 'Download Notebook');
+    download.setAttribute('download', '');
+    const view = createButton(nbviewerUrl, 'view-btn', 'fa-eye', 'View in nbviewer');
+    view.target = '_blank';
+    const colab = createButton(`https://colab.research.google.com/github/${blobUrl}`, 'colab-btn', 'fa-play', 'Open in Colab');
+    colab.target = '_blank';
+    buttons.append(download, view, colab);
+
+    container.prepend(heading, buttons);
+
+    // Tip and preview go after it
+    const tip = createElement('div', 'notebook-tip',
+      '<p><strong>Tip:</strong> For the best interactive experience, download the notebook or open it in Google Colab.</p>');
+
+    const preview = createElement('div', 'embedded-notebook', '<h3>Notebook Preview</h3>');
+    const notebookContainer = createElement('div');
+    notebookContainer.id = 'notebook-container-' + id;
+
+    const iframe = createElement('iframe');
+    iframe.id = 'notebook-iframe-' + id;
+    iframe.src = nbviewerUrl;
+    iframe.width = '100%';
+    iframe.height = '800px';
+    iframe.setAttribute('frameborder', '0');
+    iframe.addEventListener('load', () => {
+      checkIframeLoaded(id);
+      setTimeout(() => checkIframeLoaded(id), 1000);
+    });
+    iframe.addEventListener('error', () => handleIframeError(id));
+
+    const errorDiv = createElement('div', 'notebook-error-message', `
+      <div class="error-container">
+        <i class="fa-solid fa-exclamation-triangle"></i>
+        <h4>Notebook Preview Unavailable</h4>
+        <p>The notebook preview could not be loaded. This may be because:</p>
+        <ul>
+          <li>The notebook file is not yet available in the repository</li>
+          <li>The nbviewer service is temporarily unavailable</li>
+          <li>The repository is private or has access restrictions</li>
+        </ul>
+        <p>You can still download the notebook using the button above or view it directly through one of the external services.</p>
+      </div>`);
+    errorDiv.id = 'notebook-error-' + id;
+    errorDiv.style.display = 'none';
+
+    notebookContainer.append(iframe, errorDiv);
+    preview.appendChild(notebookContainer);
+    container.append(tip, preview);
+  };
+
+  const init = () => {
+    document.querySelectorAll('.jupyter-notebook-embed[data-nb]').forEach(buildEmbed);
+  };
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+})();
@@ -1,15 +1,126 @@
 #!/usr/bin/env python3
-import os, subprocess, re, shutil, argparse, html, json
+import os, subprocess, re, shutil, argparse, html, json, hashlib, atexit, socket, time
+import http.client, urllib.parse, threading, tokenize, io, ast, multiprocessing, tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+# fcntl is Unix-only; without it reflink copies are skipped
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# orjson is optional; it parses notebook JSON straight from bytes much faster than json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Parse args
 parser = argparse.ArgumentParser(description='Generate docs from source files')
 parser.add_argument('--debug', action='store_true', help='Enable debug output')
 parser.add_argument('--force-rebuild', action='store_true', help='Force rebuild all HTML files')
+parser.add_argument('--awk-decl-anchors', action='store_true',
+                    help='Add C line and declaration anchors with decl_anchors.awk instead of the built-in port')
 args = parser.parse_args()
 DEBUG = args.debug
 FORCE_REBUILD = args.force_rebuild
+USE_AWK_DECL_ANCHORS = args.awk_decl_anchors
+
+# Precompiled regular expressions used when reading sources and extracting metadata
+_SEO_METADATA_RE = re.compile(r'<!--SEO_METADATA:(.*?)-->')
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+_SEO_UNSAFE_CHARS_RE = re.compile(r'["\'\\<>]')
+_DESC_RE = re.compile(r'^\s*#\s*(.*?)\s*$\s*([a-zA-Z].*?)(?=^\s*#|\Z)', re.MULTILINE | re.DOTALL)
+_MARKDOWN_CHARS_RE = re.compile(r'[#`*_]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_TECH_PATTERNS = [
+    re.compile(r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'#include\s+["<]([^">]+)[">]'),
+]
+_H1_RE = re.compile(r'^# (.+)$', re.MULTILINE)
+_NB_UNSAFE_CHARS_RE = re.compile(r'["\'>]')
+_META_UNSAFE_CHARS_RE = re.compile(r'[^\w\s.,;:!?()-]')
+_MALFORMED_DESC_TRIGGER_RE = re.compile(r'target|href|class|style|onclick')
+_MALFORMED_DESC_META_RE = re.compile(r'<meta\s+name="description"\s+content="([^"]*(?:target|href|class|style|onclick)[^"]*)"[^>]*>')
+_DESC_UNSAFE_CHARS_RE = re.compile(r'["\'<>\\]')
+_SELF_CLOSING_A_RE = re.compile(r'<a([^>]*)/>')
+_EMPTY_A_RE = re.compile(r'<a\s+[^>]*>\s*</a>')
+_HTML_FENCE_RE = re.compile(r'```html(.*?)```', re.DOTALL)
+
+# Precompiled regular expressions used when post-processing generated HTML
+_PRE_CODE_RE = re.compile(r'<pre[^>]*><code[^>]*>.*?</code></pre>', re.DOTALL | re.IGNORECASE)
+_SOURCECODE_DIV_RE = re.compile(r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', re.DOTALL | re.IGNORECASE)
+_DOC_LINK_RE = re.compile(r'<a([^>]+)href="([^"]+)">([^<]+)</a>')
+_SOURCE_EXTENSIONS = ('.c', '.h', '.py', '.sh', '.md')
+# Dynamic path scripts from the template, stripped in a single pass
+_STRIP_DYN_JS_RE = re.compile(
+    r'<script[^>]*>\s*(?:// Dynamic base path resolution|// Helper function to create dynamic asset paths'
+    r'|window\.basePath\s*=|function\s+assetPath).*?</script>',
+    re.DOTALL
+)
+# Substrings every match of _STRIP_DYN_JS_RE contains; when none is present the regex pass is skipped
+_DYN_JS_MARKERS = ('// Dynamic base path resolution', '// Helper function to create dynamic asset paths',
+                   'window.basePath', 'assetPath')
+_BODY_TAG_RE = re.compile(r'<body[^>]*>')
+# Line-number lines of a code block, as matched by decl_anchors.awk
+_DECL_ANCHOR_LINE_RE = re.compile(r'^(?:(?P<pre>.*)<pre>1| *(?P<num>[0-9]*))$', re.MULTILINE)
+# Everything post_process_c_html rewrites, fused into one alternation dispatched on lastgroup.
+# Code blocks are matched whole; the line numbers and includes inside them are rewritten with _C_CODE_RE.
+_C_CODE_PATTERN = (
+    r'(?P<linenum>(?:\s*(?:<span class="[^"]*">\s*\d+\s*</span>|\s+\d+)\s*)+)(?P<endspan>\s*</span>)'
+    r'|(?P<inc>(?P<inc_prefix><span class="pp">#include\s*</span>)(?P<inc_open><span class="im">)'
+    r'(?:"|&quot;)(?P<inc_file>.*?)(?:"|&quot;)(?P<inc_close></span>))'
+)
+_C_CODE_RE = re.compile(_C_CODE_PATTERN, re.DOTALL)
+_C_HTML_RE = re.compile(
+    r'(?P<srcwrap>(?i:<div class="sourceCode" id="cb\d+"[^>]*>)(?P<srcbody>.*?)(?i:</div>))'
+    r'|(?P<prewrap>(?i:<pre[^>]*><code[^>]*>.*?</code></pre>))'
+    r'|' + _C_CODE_PATTERN,
+    re.DOTALL
+)
+
+# Precompiled regular expressions used when generating the index pages
+_DIR_TREE_RE = re.compile(r'```\s*\n(├.*?\n.*?└.*?)\n```', re.DOTALL)
+# Deletion table for the tree-drawing characters; the spaces they leave are stripped with the indent
+_TREE_SYMBOLS_DEL = str.maketrans('', '', '├└│─')
+# README tree levels with a precomputed list-item indent; deeper levels are handled as they come
+_TREE_MAX_DEPTH = 32
+_INDENT = ['  ' * i for i in range(_TREE_MAX_DEPTH)]
+# File-type icon class of each source extension in the directory index tables
+_EXT_CLASS = {'.c': 'file-c', '.h': 'file-c', '.py': 'file-python', '.ipynb': 'file-jupyter'}
+# One row of the directory index table
+_DIR_INDEX_ROW_TPL = (
+    '<tr>\n'
+    '  <td class="file-icon"><span class="{cls}"></span></td>\n'
+    '  <td class="file-link" style="padding-right: 2em;"><a href="{href}" class="doc-link-button">{name}</a></td>\n'
+    '  <td class="file-desc">{desc}</td>\n'
+    '</tr>\n'
+)
+_META_DESC_CONTENT_RE = re.compile(rb'<meta\s+name="description"\s+content="([^"]+)"')
+# Template placeholders of the directory index pages, located once per template by _dir_index_template:
+# the literal snippets below, the tabs block, the page content, and any leftover conditional or variable
+_DIR_INDEX_LITERALS = (
+    "$if(pagetitle)$$pagetitle$$endif$$if(wikititle)$ | $wikititle$$endif$",
+    "$if(description)$$description$$else$Computational fluid dynamics simulations using Basilisk C framework.$endif$",
+    "$if(keywords)$$keywords$$else$fluid dynamics, CFD, Basilisk, multiphase flow, computational physics$endif$",
+    "$if(reponame)$$reponame$$else$Documentation$endif$",
+    "$asset_path_prefix$",
+)
+_DIR_INDEX_TEMPLATE_RE = re.compile(
+    '(?P<literal>' + '|'.join(re.escape(literal) for literal in _DIR_INDEX_LITERALS) + ')'
+    r'|(?P<tabs>\$if\(tabs\)\$.*?\$tabs\$.*?\$endif\$)'
+    r'|(?P<content><div class="page-content">\s*.*?\$body\$.*?</div>)'
+    r'|(?P<cond>\$if\([^)]+\)\$.*?\$endif\$)'
+    r'|(?P<var>\$[a-zA-Z0-9_]+\$)',
+    re.DOTALL
+)
 
 def debug_print(msg):
     """
@@ -20,7 +131,31 @@ def debug_print(msg):
     """
     if DEBUG: print(msg)
 
-def calculate_asset_prefix(output_path: Path, docs_dir: Path) -> str:
+def _read_text(p: Union[str, Path]) -> str:
+    """
+    Reads a UTF-8 text file in one call, bypassing the text-mode I/O layer.
+    
+    Args:
+        p: Path of the file to read.
+    
+    Returns:
+        The decoded content of the file.
+    """
+    with open(p, 'rb') as f:
+        return f.read().decode('utf-8')
+
+def _write_text(p: Union[str, Path], content: str) -> None:
+    """
+    Writes a UTF-8 text file in one call, bypassing the text-mode I/O layer.
+    
+    Args:
+        p: Path of the file to write.
+        content: Text to write.
+    """
+    with open(p, 'wb') as f:
+        f.write(content.encode('utf-8'))
+
+def calculate_asset_prefix(output_path: Union[str, Path], docs_dir: Union[str, Path]) -> str:
     """
     Returns the relative path prefix to reference assets from an HTML file based on its location within the documentation directory.
     
@@ -31,13 +166,24 @@ def calculate_asset_prefix(output_path: Path, docs_dir: Path) -> str:
     Returns:
         A string representing the relative path prefix (e.g., ".", "..", "../..") to use for asset references.
     """
-    try:
-        if output_path.name == "index.html" and output_path.parent == docs_dir:
-            return "."
-        depth = len(output_path.relative_to(docs_dir).parents) - 1
-        return "." if depth <= 0 else "/".join([".."] * depth)
-    except ValueError:
+    # The directory depth is the number of separators in the relative path
+    rel_path = os.path.relpath(str(output_path), str(docs_dir))
+    if rel_path.startswith('..'):
         return "."
+    return _asset_prefix_for_depth(rel_path.count(os.sep))
+
+@lru_cache(maxsize=None)
+def _asset_prefix_for_depth(depth: int) -> str:
+    """
+    Returns the asset path prefix for a page the given number of directories below the documentation root.
+    
+    Args:
+        depth: Number of directories between the documentation root and the page.
+    
+    Returns:
+        "." for the root itself, otherwise ".." repeated depth times and joined with "/".
+    """
+    return "." if depth == 0 else "/".join([".."] * depth)
 
 def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     """
@@ -55,7 +201,7 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     metadata = {}
     
     # Check for embedded SEO metadata (used by Jupyter notebooks)
-    seo_match = re.search(r'<!--SEO_METADATA:(.*?)-->', content)
+    seo_match = _SEO_METADATA_RE.search(content)
     if seo_match:
         try:
             debug_print(f"Found embedded SEO metadata in {file_path}")
@@ -64,23 +210,22 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
                 metadata.update(embedded_metadata)
                 # Extra sanitization of description to be absolutely safe
                 if "description" in metadata:
-                    metadata["description"] = re.sub(r'<[^>]*>', '', metadata["description"])
-                    metadata["description"] = re.sub(r'["\'\\\<>]', '', metadata["description"])
+                    metadata["description"] = _HTML_TAG_RE.sub('', metadata["description"])
+                    metadata["description"] = _SEO_UNSAFE_CHARS_RE.sub('', metadata["description"])
                 return metadata
         except Exception as e:
             debug_print(f"Error parsing embedded SEO metadata: {e}")
     
     # Extract first paragraph as description (fallback for non-notebook files)
-    desc_match = re.search(r'^\s*#\s*(.*?)\s*$\s*([a-zA-Z].*?)(?=^\s*#|\Z)', 
-                          content, re.MULTILINE | re.DOTALL)
+    desc_match = _DESC_RE.search(content)
     if desc_match:
         description = desc_match.group(2).strip()
         if not description or description.startswith(('```', '`', '#', '//')):
             description = desc_match.group(1).strip()
         
         # Clean up description and truncate to ~160 chars
-        description = re.sub(r'[#`*_]', '', description)
-        description = re.sub(r'\s+', ' ', description).strip()
+        description = _MARKDOWN_CHARS_RE.sub('', description)
+        description = _WHITESPACE_RE.sub(' ', description).strip()
         if len(description) > 160:
             description = description[:157] + "..."
         metadata["description"] = description
@@ -92,14 +237,8 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     keywords.update([p.lower() for p in name_parts if len(p) > 3])
     
     # Add common technical terms if found in content
-    tech_patterns = [
-        r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'#include\s+["<]([^">]+)[">]'
-    ]
-    for pattern in tech_patterns:
-        for match in re.finditer(pattern, content):
+    for pattern in _TECH_PATTERNS:
+        for match in pattern.finditer(content):
             if match.group(1) and len(match.group(1)) > 3:
                 keywords.add(match.group(1).lower())
     
@@ -110,8 +249,8 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     # Ensure description is safe for HTML attributes
     if "description" in metadata:
         # Remove HTML tags and replace quotes
-        metadata["description"] = re.sub(r'<[^>]*>', '', metadata["description"])
-        metadata["description"] = re.sub(r'"', '\'', metadata["description"])
+        metadata["description"] = _HTML_TAG_RE.sub('', metadata["description"])
+        metadata["description"] = metadata["description"].replace('"', '\'')
         
         # Truncate if still too long
         if len(metadata["description"]) > 160:
@@ -130,7 +269,30 @@ DARCSIT_DIR = BASILISK_DIR / 'src' / 'darcsit'
 TEMPLATE_PATH = REPO_ROOT / '.github' / 'assets' / 'custom_template.html'
 LITERATE_C_SCRIPT = DARCSIT_DIR / 'literate-c'
 BASE_URL = "/"
+BUILD_CACHE_PATH = DOCS_DIR / '.build_cache.json'
+BUILD_CACHE_VERSION = 2
+DESCRIPTION_CACHE_PATH = DOCS_DIR / '.desc_cache.json'
 CSS_PATH = REPO_ROOT / '.github' / 'assets' / 'css' / 'custom_styles.css'
+PANDOC_SERVER_TIMEOUT = 10
+
+# Absolute tool paths let subprocess start children with posix_spawn instead of fork+exec
+PANDOC_BIN = shutil.which('pandoc') or 'pandoc'
+SH_BIN = shutil.which('sh') or 'sh'
+AWK_BIN = shutil.which('awk') or 'awk'
+
+# URL of the long-lived `pandoc server`, if one is running (set by main / init_build_worker)
+PANDOC_SERVER_URL: Optional[str] = None
+
+# Keep-alive connection of the current process to the pandoc server, opened on first use
+_PANDOC_SERVER_CONNECTION: Optional[http.client.HTTPConnection] = None
+
+# Long-lived literate-c coprocess of the current process, started on first use
+_LITERATE_C_COPROCESS: Optional[subprocess.Popen] = None
+_LITERATE_C_LOCK = threading.Lock()
+
+# Reads one path per line, runs literate-c on it and terminates its output with NUL plus the exit status.
+# literate-c gets /dev/null as stdin, so neither it nor its children (e.g. ffmpeg) can eat the queued paths.
+_LITERATE_C_LOOP = 'while IFS= read -r p; do "$0" "$p" 0 </dev/null 2>/dev/null; printf \'\\0%d\\n\' $?; done'
 
 # Get repository name from directory
 REPO_NAME = REPO_ROOT.name
@@ -143,6 +305,35 @@ except Exception as e:
     print(f"Warning: Could not read CNAME file: {e}")
     BASE_DOMAIN = "https://test.comphy-lab.org"
 
+@lru_cache(maxsize=8)
+def _read_template(path_str: str, mtime_ns: int) -> str:
+    """
+    Reads a template file, memoized on its path and modification time.
+    
+    Args:
+        path_str: Path of the template file as a string.
+        mtime_ns: Modification time of the file, so an edited file is read again.
+    
+    Returns:
+        The content of the file.
+    """
+    return _read_text(path_str)
+
+@lru_cache(maxsize=8)
+def _read_h1(path_str: str, mtime_ns: int) -> Optional[str]:
+    """
+    Finds the first H1 markdown header of a file, memoized on its path and modification time.
+    
+    Args:
+        path_str: Path of the markdown file as a string.
+        mtime_ns: Modification time of the file, so an edited file is read again.
+    
+    Returns:
+        The header text, or None if the file has no H1 header.
+    """
+    h1_match = _H1_RE.search(_read_text(path_str))
+    return h1_match.group(1).strip() if h1_match else None
+
 def extract_h1_from_readme(readme_path: Path) -> str:
     """
     Extracts the first H1 markdown header from a README file.
@@ -150,13 +341,11 @@ def extract_h1_from_readme(readme_path: Path) -> str:
     If no H1 header is found or the file cannot be read, returns "Documentation".
     """
     try:
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            h1_match = re.search(r'^# (.+)$', content, re.MULTILINE)
-            if h1_match:
-                return h1_match.group(1).strip()
-            debug_print("Warning: No h1 heading found in README.md")
-            return "Documentation"
+        title = _read_h1(str(readme_path), readme_path.stat().st_mtime_ns)
+        if title:
+            return title
+        debug_print("Warning: No h1 heading found in README.md")
+        return "Documentation"
     except Exception as e:
         print(f"Error reading README.md: {e}")
         return "Documentation"
@@ -175,8 +364,7 @@ def process_template_for_assets(template_path: Path) -> str:
         The content of the template file as a string, or an empty string if an error occurs.
     """
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
+        template_content = _read_template(str(template_path), template_path.stat().st_mtime_ns)
         print(f"Repository name: {REPO_NAME}")
         debug_print("Template processed for correct asset paths")
         return template_content
@@ -184,11 +372,14 @@ def process_template_for_assets(template_path: Path) -> str:
         print(f"Error processing template: {e}")
         return ""
 
-def validate_config() -> bool:
+def validate_config(temp_dir: Path) -> bool:
     """
     Validates the existence of essential directories and files required for documentation generation.
     
-    Checks for the presence of core directories and files, processes the HTML template for Pandoc, and creates a temporary template file for use during conversion. Updates the global template path if successful.
+    Checks for the presence of core directories and files, processes the HTML template for Pandoc, and creates a temporary template file in temp_dir for use during conversion. Updates the global template path if successful.
+    
+    Args:
+        temp_dir: Temporary directory that holds the processed template for the duration of the run.
     
     Returns:
         True if all required paths exist and the template is processed successfully; False otherwise.
@@ -211,17 +402,10 @@ def validate_config() -> bool:
     if not processed_template:
         return False
         
-    temp_template_path = TEMPLATE_PATH.with_suffix('.temp.html')
-    
-    if temp_template_path.exists():
-        try:
-            temp_template_path.unlink()
-        except Exception as e:
-            print(f"Warning: Could not delete existing temporary template: {e}")
+    temp_template_path = temp_dir / TEMPLATE_PATH.with_suffix('.temp.html').name
     
     try:
-        with open(temp_template_path, 'w', encoding='utf-8') as f:
-            f.write(processed_template)
+        _write_text(temp_template_path, processed_template)
         TEMPLATE_PATH = temp_template_path
     except Exception as e:
         print(f"Error creating temporary template file: {e}")
@@ -229,82 +413,284 @@ def validate_config() -> bool:
     
     return True
 
-def find_source_files(root_dir: Path, source_dirs: List[str]) -> List[Path]:
+def compute_build_key(template_path: Path, literate_c_script: Path, repo_root: Path) -> str:
+    """
+    Computes a global key that invalidates every cached page when the build inputs change.
+    
+    The key covers the cache format version, the HTML template, the literate-C preprocessor and this script itself, the site settings every page embeds (wiki title, repository name, base URL and domain) and the src-local listing that decides which includes become links, so changing any of them forces a full rebuild.
+    
+    Args:
+        template_path: Path to the Pandoc HTML template.
+        literate_c_script: Path to the literate-C preprocessor.
+        repo_root: Path to the repository root, for the src-local listing.
+    
+    Returns:
+        A hex SHA-256 digest identifying the current build configuration.
+    """
+    digest = hashlib.sha256(f"v{BUILD_CACHE_VERSION}".encode('utf-8'))
+    for path in (template_path, literate_c_script, Path(__file__)):
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+    for value in (WIKI_TITLE, REPO_NAME, BASE_URL, BASE_DOMAIN, *sorted(_src_local_files(str(repo_root)))):
+        digest.update(b'\0')
+        digest.update(value.encode('utf-8'))
+    return digest.hexdigest()
+
+def load_build_cache(cache_path: Path, build_key: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads the per-file build cache, discarding it if it was written for a different build key.
+    
+    Args:
+        cache_path: Path to the JSON cache file.
+        build_key: The key returned by compute_build_key for this run.
+    
+    Returns:
+        A dictionary mapping repository-relative source paths to their cache entries, or an empty dictionary if no usable cache exists.
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('build_key') != build_key:
+        debug_print("Build cache missing or stale, rebuilding all files")
+        return {}
+    return data.get('files', {})
+
+def save_build_cache(cache_path: Path, build_key: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Writes the per-file build cache to disk.
+    
+    Args:
+        cache_path: Path to the JSON cache file.
+        build_key: The key returned by compute_build_key for this run.
+        entries: Mapping of repository-relative source paths to their cache entries.
+    """
+    try:
+        _write_text(cache_path, json.dumps({'build_key': build_key, 'files': entries}, indent=1, sort_keys=True))
+        debug_print(f"Saved build cache to {cache_path}")
+    except OSError as e:
+        print(f"Warning: Could not write build cache: {e}")
+
+def load_description_cache(cache_path: Path) -> Dict[str, List[Any]]:
+    """
+    Loads the cache of page descriptions used by the directory index pages.
+    
+    Args:
+        cache_path: Path to the JSON cache file.
+    
+    Returns:
+        A dictionary mapping docs-relative page paths to [modification time, description] pairs, or an empty dictionary if no usable cache exists.
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def save_description_cache(cache_path: Path, entries: Dict[str, List[Any]]) -> None:
+    """
+    Writes the cache of page descriptions to disk.
+    
+    Args:
+        cache_path: Path to the JSON cache file.
+        entries: Mapping of docs-relative page paths to [modification time, description] pairs.
+    """
+    try:
+        _write_text(cache_path, json.dumps(entries, indent=1, sort_keys=True))
+        debug_print(f"Saved description cache to {cache_path}")
+    except OSError as e:
+        print(f"Warning: Could not write description cache: {e}")
+
+def _tags_path(file_path: Union[str, Path]) -> Path:
+    """
+    Returns the tags file whose declarations run_awk_post_processing links in a source file's page.
+    """
+    file_path = Path(file_path)
+    try:
+        file_path = REPO_ROOT / file_path.relative_to(REPO_ROOT)
+    except ValueError:
+        pass
+    return file_path.with_suffix(file_path.suffix + '.tags')
+
+def _file_sha(file_path: Union[str, Path]) -> str:
+    """
+    Returns the hex SHA-256 digest of a file's content.
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def is_cached_build_current(file_path: Union[str, Path], entry: Optional[Dict[str, Any]]) -> bool:
+    """
+    Checks whether a source file and its tags file are unchanged since its HTML was last generated.
+    
+    A matching modification time is trusted directly; otherwise the file content is hashed and compared, so a touched but unmodified file is still skipped. The tags file, which supplies the declaration anchors, is checked the same way, and a tags file that appeared or disappeared invalidates the page. The entry is refreshed in place on a content match.
+    
+    Args:
+        file_path: Path to the source file.
+        entry: The cache entry recorded for this file, if any.
+    
+    Returns:
+        True if the cached HTML output is still valid, False otherwise.
+    """
+    if not entry:
+        return False
+    st = os.stat(file_path)
+    if entry.get('mtime') != st.st_mtime_ns:
+        if entry.get('sha') != _file_sha(file_path):
+            return False
+        entry['mtime'] = st.st_mtime_ns
+    
+    tags_path = _tags_path(file_path)
+    try:
+        tags_mtime = os.stat(tags_path).st_mtime_ns
+    except OSError:
+        return entry.get('tags_sha') is None
+    if entry.get('tags_mtime') != tags_mtime:
+        if entry.get('tags_sha') != _file_sha(tags_path):
+            return False
+        entry['tags_mtime'] = tags_mtime
+    return True
+
+def make_build_cache_entry(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Creates the cache entry recording the current state of a source file and of its tags file, if any.
+    """
+    entry = {
+        'sha': _file_sha(file_path),
+        'mtime': os.stat(file_path).st_mtime_ns,
+        'tags_sha': None,
+        'tags_mtime': None,
+    }
+    tags_path = _tags_path(file_path)
+    try:
+        entry['tags_mtime'] = os.stat(tags_path).st_mtime_ns
+        entry['tags_sha'] = _file_sha(tags_path)
+    except OSError:
+        pass
+    return entry
+
+def find_source_files(root_dir: Path, source_dirs: List[str]) -> List[str]:
     """
     Finds all supported source files in the specified directories and root directory.
     
-    Searches recursively within each source directory and non-recursively in the root directory for files with supported extensions (.c, .h, .py, .sh, .ipynb) or named 'Makefile', excluding files ending with '.dat'.
+    Searches recursively within each source directory and non-recursively in the root directory for files with supported extensions (.c, .h, .py, .sh, .ipynb) or named 'Makefile', excluding files ending with '.dat'. Directories are walked with os.scandir so that file-type checks reuse the cached directory entry instead of issuing a stat() per path, one tree level at a time with the directories of a level listed concurrently, since listing is bound by filesystem latency.
     
     Args:
         root_dir: The root directory to search for source files.
         source_dirs: List of subdirectory names to search recursively.
     
     Returns:
-        A sorted list of Paths to the discovered source files.
+        A sorted list of the discovered source file paths, as strings.
     """
     valid_exts = {'.c', '.h', '.py', '.sh', '.ipynb'}
     valid_names = {'Makefile'}
-    files = set()
-
-    for dir_name in source_dirs:
-        src_path = root_dir / dir_name
-        if src_path.is_dir():
-            for f in src_path.rglob('*'):
-                if f.is_file():
-                    if f.name in valid_names:
-                        files.add(f)
-                    elif f.suffix in valid_exts and not f.name.endswith('.dat'):
-                        files.add(f)
 
+    def scan(dir_path: str):
+        """
+        Lists one directory, returning the supported source files and the subdirectories in it.
+        """
+        found, subdirs = [], []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    name = entry.name
+                    if name in valid_names or (os.path.splitext(name)[1] in valid_exts and not name.endswith('.dat')):
+                        found.append(entry.path)
+        return found, subdirs
+
+    root_dir = str(root_dir)
+    
     # Search for .sh files and Makefiles in root directory
-    for f in root_dir.iterdir():
-        if f.is_file():
-            if f.name in valid_names:
-                files.add(f)
-            elif f.suffix in valid_exts and not f.name.endswith('.dat'):
-                files.add(f)
+    files, _ = scan(root_dir)
+    
+    level = [os.path.join(root_dir, dir_name) for dir_name in source_dirs]
+    level = [path for path in level if os.path.isdir(path)]
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        while level:
+            next_level = []
+            for found, subdirs in executor.map(scan, level):
+                files.extend(found)
+                next_level.extend(subdirs)
+            level = next_level
 
     return sorted(files)
 
-def process_markdown_file(file_path: Path) -> str:
+def process_markdown_file(file_path: Path, file_content: Optional[str] = None) -> str:
     """
     Reads and returns the content of a Markdown file for further processing or conversion.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return _read_text(file_path) if file_content is None else file_content
+
+# Runs of backticks, to pick a code fence longer than any of them
+_BACKTICK_RUN_RE = re.compile(r'`+')
 
-def process_shell_file(file_path: Path) -> str:
+def process_shell_file(file_path: Path, file_content: Optional[str] = None) -> str:
     """
     Reads a shell script file and returns its content as a Markdown-formatted bash code block.
     
-    The script content is escaped to prevent Pandoc from interpreting shell variables or boolean assignments.
+    Pandoc leaves everything inside a code block alone, so the script is kept verbatim; the fence is made longer than any run of backticks in the script so the block cannot end early.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        # Escape any potential variables that could conflict with Pandoc
-        content = content.replace("$", "\\$")
-        # Escape variable assignments with true/false values
-        content = content.replace("=true", "=\\true")
-        content = content.replace("=false", "=\\false")
-        return f"# {file_path.name}\n\n```bash\n{content}\n```"
+    content = _read_text(file_path) if file_content is None else file_content
+    fence = '`' * max(3, max((len(run) for run in _BACKTICK_RUN_RE.findall(content)), default=0) + 1)
+    return f"# {file_path.name}\n\n{fence}bash\n{content}\n{fence}"
 
-def process_jupyter_notebook(file_path: Path) -> str:
+def _parse_first_md(source: str) -> tuple:
+    """
+    Extracts the title, description and key features from a notebook's first markdown cell in one pass.
+    
+    The title is the first H1 header, the description is the first prose paragraph after it (sub-headers are skipped), and the features are the first three bullet items of the cell.
+    
+    Args:
+        source: The markdown source of the cell.
+    
+    Returns:
+        A (title, description, features) tuple; title is None and description empty if not found.
+    """
+    title = None
+    desc_lines = []
+    features = []
+    # pre: before the title, desc: collecting the paragraph after it, body: after the paragraph
+    state = 'pre'
+    for line in source.split('\n'):
+        stripped = line.strip()
+        if state == 'pre':
+            if line[:1] == '#' and line[1:2].isspace() and stripped[1:].strip():
+                title = stripped[1:].strip()
+                state = 'desc'
+                continue
+        elif state == 'desc':
+            # Sub-headers between the title and the first paragraph are skipped
+            if stripped and not stripped.startswith('#'):
+                desc_lines.append(stripped)
+                continue
+            if desc_lines:
+                state = 'body'
+        
+        # Bullet items: -, * or + followed by whitespace and text
+        if stripped[:1] in ('*', '-', '+') and stripped[1:2].isspace() and stripped[2:].strip():
+            features.append(stripped[2:].strip())
+            if len(features) == 3 and state == 'body':
+                break
+    
+    return title, ' '.join(desc_lines), features[:3]
+
+def process_jupyter_notebook(file_path: Path, file_content: Optional[str] = None) -> str:
     """
     Generates an HTML snippet to embed a Jupyter notebook with preview, download, and external viewing options.
     
-    Reads the notebook file, extracts the title, description, and up to three key features from the first markdown cell (if present), and sanitizes metadata for safe HTML embedding. The output includes a preview iframe (using nbviewer), download and external links (nbviewer, Colab), and fallback messaging if the preview cannot be loaded. SEO metadata is embedded in an HTML comment for later extraction.
+    Reads the notebook file, extracts the title, description, and up to three key features from the first markdown cell (if present), and sanitizes metadata for safe HTML embedding. The output is a small container carrying the notebook location in data attributes; assets/js/notebook-embed.js adds the preview iframe (using nbviewer), download and external links (nbviewer, Colab), and fallback messaging if the preview cannot be loaded. SEO metadata is embedded in an HTML comment for later extraction.
     
     Args:
         file_path: Path to the Jupyter notebook file.
+        file_content: Optional already-read notebook text; the file is read if omitted.
     
     Returns:
         A Markdown-formatted string containing the HTML embed for the notebook, including metadata and interactive elements.
     """
     notebook_filename = file_path.name
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            notebook_content = f.read()
-        
         rel_path = file_path.relative_to(REPO_ROOT).parent
         notebook_path = notebook_filename if rel_path.as_posix() == '.' else f"{rel_path}/{notebook_filename}"
             
@@ -313,21 +699,19 @@ def process_jupyter_notebook(file_path: Path) -> str:
         notebook_features = []
         
         try:
-            notebook_data = json.loads(notebook_content)
-            for cell in notebook_data.get('cells', []):
-                if cell.get('cell_type') == 'markdown':
-                    source = ''.join(cell.get('source', []))
-                    title_match = re.search(r'^#\s+(.+)$', source, re.MULTILINE)
-                    if title_match:
-                        notebook_title = title_match.group(1).strip()
-                        desc_match = re.search(r'^#\s+.+\n\n(.+?)(?=\n\n|\Z)', source, re.DOTALL | re.MULTILINE)
-                        if desc_match:
-                            notebook_description = desc_match.group(1).strip()
-                            features_match = re.findall(r'^\s*[\*\-\+]\s+(.+)$', source, re.MULTILINE)
-                            if features_match:
-                                notebook_features = [f.strip() for f in features_match[:3]]
-                        break
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Only the first markdown cell carries the title, description and features
+            notebook_data = _json_loads(file_path.read_bytes() if file_content is None else file_content)
+            first_md = next((cell for cell in notebook_data.get('cells', ())
+                             if cell.get('cell_type') == 'markdown'), None)
+            if first_md is not None:
+                title, description, features = _parse_first_md(''.join(first_md.get('source', [])))
+                if title:
+                    notebook_title = title
+                    if description:
+                        notebook_description = description
+                        if features:
+                            notebook_features = features
+        except (ValueError, UnicodeDecodeError):
             pass
             
         if not notebook_description:
@@ -344,13 +728,13 @@ def process_jupyter_notebook(file_path: Path) -> str:
         # This is critical to prevent meta tag corruption
         
         # Step 1: Remove all HTML tags from the description
-        notebook_description = re.sub(r'<[^>]*>', '', notebook_description)
+        notebook_description = _HTML_TAG_RE.sub('', notebook_description)
         
         # Step 2: Remove any potential content that might break attributes
-        notebook_description = re.sub(r'["\'>]', '', notebook_description)
+        notebook_description = _NB_UNSAFE_CHARS_RE.sub('', notebook_description)
         
         # Step 3: Create a highly sanitized version for use in meta tags
-        meta_safe_description = re.sub(r'[^\w\s.,;:!?()-]', '', notebook_description)
+        meta_safe_description = _META_UNSAFE_CHARS_RE.sub('', notebook_description)
         meta_safe_description = meta_safe_description.strip()
         if len(meta_safe_description) > 160:
             meta_safe_description = meta_safe_description[:157] + "..."
@@ -368,26 +752,11 @@ def process_jupyter_notebook(file_path: Path) -> str:
             "meta_tags": f'<meta name="description" content="{meta_safe_description}">\n'
         }
         
+        # Buttons, tip and nbviewer preview are built client-side by assets/js/notebook-embed.js
         embed_html = f"""# {safe_notebook_title}
 
 ```{{=html}}
-<div class="jupyter-notebook-embed">
-    <h2>Jupyter Notebook: {safe_notebook_title}</h2>
-    
-    <div class="notebook-action-buttons">
-        <a href="{notebook_filename}" download class="notebook-btn download-btn">
-            <i class="fa-solid fa-download"></i> Download Notebook
-        </a>
-        <a href="https://nbviewer.org/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
-           target="_blank" class="notebook-btn view-btn">
-            <i class="fa-solid fa-eye"></i> View in nbviewer
-        </a>
-        <a href="https://colab.research.google.com/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
-           target="_blank" class="notebook-btn colab-btn">
-            <i class="fa-solid fa-play"></i> Open in Colab
-        </a>
-    </div>
-    
+<div class="jupyter-notebook-embed" data-nb="{html.escape(notebook_filename)}" data-nb-path="{html.escape(notebook_path)}" data-repo="{html.escape(REPO_NAME)}" data-title="{safe_notebook_title}">
     <div class="notebook-preview">
         <h3>About this notebook</h3>
         <p>{safe_notebook_description}</p>
@@ -397,74 +766,7 @@ def process_jupyter_notebook(file_path: Path) -> str:
             {features_html}
         </ul>
     </div>
-    
-    <div class="notebook-tip">
-        <p><strong>Tip:</strong> For the best interactive experience, download the notebook or open it in Google Colab.</p>
-    </div>
-
-    <!-- Embedded Jupyter Notebook -->
-    <div class="embedded-notebook">
-        <h3>Notebook Preview</h3>
-        <div id="notebook-container-{notebook_filename.replace('.', '-')}" >
-            <iframe id="notebook-iframe-{notebook_filename.replace('.', '-')}" 
-                    src="https://nbviewer.org/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
-                    width="100%" height="800px" frameborder="0"
-                    onload="checkIframeLoaded('{notebook_filename.replace('.', '-')}')"
-                    onerror="handleIframeError('{notebook_filename.replace('.', '-')}')"></iframe>
-            <div id="notebook-error-{notebook_filename.replace('.', '-')}" 
-                 class="notebook-error-message" style="display: none;">
-                <div class="error-container">
-                    <i class="fa-solid fa-exclamation-triangle"></i>
-                    <h4>Notebook Preview Unavailable</h4>
-                    <p>The notebook preview could not be loaded. This may be because:</p>
-                    <ul>
-                        <li>The notebook file is not yet available in the repository</li>
-                        <li>The nbviewer service is temporarily unavailable</li>
-                        <li>The repository is private or has access restrictions</li>
-                    </ul>
-                    <p>You can still download the notebook using the button above or view it directly through one of the external services.</p>
-                </div>
-            </div>
-        </div>
-    </div>
 </div>
-
-<script>
-    function checkIframeLoaded(id) {{
-        try {{
-            const iframe = document.getElementById('notebook-iframe-' + id);
-            const iframeContent = iframe.contentWindow || iframe.contentDocument;
-            try {{
-                if (iframeContent.document.title.includes('404') || 
-                    iframeContent.document.body.textContent.includes('404 Not Found')) {{
-                    handleIframeError(id);
-                }}
-            }} catch (e) {{}}
-        }} catch (e) {{
-            handleIframeError(id);
-        }}
-    }}
-    
-    function handleIframeError(id) {{
-        const iframe = document.getElementById('notebook-iframe-' + id);
-        const errorDiv = document.getElementById('notebook-error-' + id);
-        
-        if (iframe && errorDiv) {{
-            iframe.style.display = 'none';
-            errorDiv.style.display = 'block';
-        }}
-    }}
-    
-    document.addEventListener('DOMContentLoaded', function() {{
-        const iframes = document.querySelectorAll('iframe[id^="notebook-iframe-"]');
-        iframes.forEach(iframe => {{
-            iframe.addEventListener('load', function() {{
-                const id = iframe.id.replace('notebook-iframe-', '');
-                setTimeout(function() {{ checkIframeLoaded(id); }}, 1000);
-            }});
-        }});
-    }});
-</script>
 ```
 """
         # Add metadata to the embed_html for extraction later
@@ -473,92 +775,163 @@ def process_jupyter_notebook(file_path: Path) -> str:
     except Exception as e:
         return f"# {notebook_filename}\n\nError processing notebook: {str(e)}"
 
-def process_python_file(file_path: Path) -> str:
+def process_python_file(file_path: Path, file_content: Optional[str] = None) -> str:
     """
     Converts a Python source file into Markdown by extracting docstrings as prose and wrapping code sections in fenced code blocks.
     
+    Docstrings are found with the tokenize module: a triple-quoted string that starts at column 0 and forms a statement of its own becomes prose, everything else stays code.
+    
     Args:
         file_path: Path to the Python source file.
+        file_content: Optional already-read file content; the file is read if omitted.
     
     Returns:
         A Markdown-formatted string with docstrings as paragraphs and code as Python code blocks.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        file_content = f.read()
+    if file_content is None:
+        file_content = _read_text(file_path)
     
     lines = file_content.split('\n')
+    
+    # Map the first line of each docstring to (last line, cleaned prose lines)
+    docstrings = {}
+    try:
+        tokens = [tok for tok in tokenize.generate_tokens(io.StringIO(file_content).readline)
+                  if tok.type not in (tokenize.NL, tokenize.COMMENT)]
+    except (tokenize.TokenError, SyntaxError) as e:
+        debug_print(f"  [Debug] Could not tokenize {file_path}: {e}")
+        return f"```python\n{file_content}\n```"
+    
+    for i, tok in enumerate(tokens):
+        if tok.type != tokenize.STRING or tok.start[1] != 0:
+            continue
+        if tok.string.lstrip('rRuU')[:3] not in ('"""', "'''"):
+            continue
+        prev_type = tokens[i - 1].type if i > 0 else None
+        next_type = tokens[i + 1].type if i + 1 < len(tokens) else None
+        if prev_type not in (None, tokenize.ENCODING, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT):
+            continue
+        if next_type not in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            continue
+        try:
+            doc_text = ast.literal_eval(tok.string)
+        except (ValueError, SyntaxError):
+            continue
+        doc_lines = [doc_line.strip() for doc_line in doc_text.splitlines()]
+        while doc_lines and not doc_lines[0]:
+            doc_lines.pop(0)
+        while doc_lines and not doc_lines[-1]:
+            doc_lines.pop()
+        docstrings[tok.start[0] - 1] = (tok.end[0] - 1, doc_lines)
+    
     processed_lines = []
-    in_code_block = False
     code_block = []
-    in_docstring = False
-    docstring_lines = []
-    
-    for line in lines:
-        if line.strip().startswith('"""') or line.strip().startswith("'''"):
-            if in_docstring:
-                in_docstring = False
-                clean_docstring = []
-                for doc_line in docstring_lines:
-                    if doc_line.strip() in ('"""', "'''"):
-                        continue
-                    doc_line = doc_line.strip()
-                    if doc_line.startswith('"""') or doc_line.startswith("'''"):
-                        doc_line = doc_line[3:]
-                    if doc_line.endswith('"""') or doc_line.endswith("'''"):
-                        doc_line = doc_line[:-3]
-                    clean_docstring.append(doc_line.strip())
-                
-                if clean_docstring:
-                    processed_lines.append("")
-                    processed_lines.extend(clean_docstring)
-                    processed_lines.append("")
-                docstring_lines = []
-            else:
-                in_docstring = True
-                if in_code_block:
-                    processed_lines.append("```python")
-                    processed_lines.extend(code_block)
-                    processed_lines.append("```")
-                    code_block = []
-                    in_code_block = False
+    line_index = 0
+    while line_index < len(lines):
+        if line_index in docstrings:
+            if code_block:
+                processed_lines.append("```python")
+                processed_lines.extend(code_block)
+                processed_lines.append("```")
+                code_block = []
+            last_line, doc_lines = docstrings[line_index]
+            if doc_lines:
+                processed_lines.append("")
+                processed_lines.extend(doc_lines)
+                processed_lines.append("")
+            line_index = last_line + 1
             continue
         
-        if in_docstring:
-            docstring_lines.append(line)
-            continue
-        
-        if not in_code_block and line.strip():
-            in_code_block = True
-            code_block.append(line)
-        elif in_code_block:
+        line = lines[line_index]
+        if code_block or line.strip():
             code_block.append(line)
         else:
             processed_lines.append(line)
+        line_index += 1
     
-    if in_code_block:
+    if code_block:
         processed_lines.append("```python")
         processed_lines.extend(code_block)
         processed_lines.append("```")
     
-    if in_docstring:
-        processed_lines.append("")
-        processed_lines.extend(docstring_lines)
-        processed_lines.append("")
-    
     return '\n'.join(processed_lines)
 
-def process_c_file(file_path: Path, literate_c_script: Path) -> str:
+def run_literate_c_coprocess(file_path: Path, literate_c_script: Path) -> Optional[str]:
+    """
+    Runs the literate-C preprocessor on a file through a coprocess kept alive for the whole build.
+    
+    The coprocess is a shell loop started once per (worker) process, so the preprocessor's interpreter startup is not paid for every C file. It ends by itself at end of input, when the process that owns its stdin pipe exits.
+    
+    Args:
+        file_path: Path to the C or C++ source file.
+        literate_c_script: Path to the literate-C preprocessor.
+    
+    Returns:
+        The preprocessor output, or None if it failed or the coprocess is unavailable.
+    """
+    global _LITERATE_C_COPROCESS
+    if '\n' in str(file_path):
+        return None
+    
+    with _LITERATE_C_LOCK:
+        if _LITERATE_C_COPROCESS is None or _LITERATE_C_COPROCESS.poll() is not None:
+            _LITERATE_C_COPROCESS = subprocess.Popen(
+                [SH_BIN, '-c', _LITERATE_C_LOOP, str(literate_c_script)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        coprocess = _LITERATE_C_COPROCESS
+        
+        try:
+            coprocess.stdin.write(f"{file_path}\n".encode('utf-8'))
+            coprocess.stdin.flush()
+            
+            # Read until the NUL terminator and the status line that follows it
+            output = bytearray()
+            while True:
+                end = output.find(b'\0')
+                if end >= 0 and output.find(b'\n', end) >= 0:
+                    break
+                chunk = coprocess.stdout.read1(65536)
+                if not chunk:
+                    raise EOFError("literate-c coprocess exited")
+                output += chunk
+        except (OSError, EOFError) as e:
+            debug_print(f"  [Debug] literate-c coprocess failed for {file_path}: {e}")
+            coprocess.kill()
+            _LITERATE_C_COPROCESS = None
+            return None
+    
+    status = output[end + 1:].strip()
+    if status != b'0':
+        debug_print(f"  [Debug] literate-c exited with status {status.decode()} for {file_path}")
+        return None
+    return output[:end].decode('utf-8')
+
+def process_c_file(file_path: Path, literate_c_script: Path, file_content: Optional[str] = None) -> str:
     """
     Converts a C or C++ source file to Markdown using a literate-C preprocessor.
     
     Attempts to process the file with the specified literate-C script. If preprocessing fails,
     returns the file content wrapped in a Markdown C code block.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        file_content = f.read()
+    if file_content is None:
+        file_content = _read_text(file_path)
     
     markdown_content = f"""# {file_path.name}\n\n```c\n{file_content}\n```"""
     
+    try:
+        content = run_literate_c_coprocess(file_path, literate_c_script)
+    except Exception as e:
+        debug_print(f"  [Debug] literate-c coprocess unavailable: {e}")
+        content = None
+    if content is not None:
+        if content.strip():
+            return content.replace('~~~literatec', '~~~c')
+        return markdown_content
+    
+    # Fall back to a one-off run, which also reports the preprocessor's error output
     literate_c_cmd = [str(literate_c_script), str(file_path), '0']
     
     try:
@@ -567,7 +940,8 @@ def process_c_file(file_path: Path, literate_c_script: Path) -> str:
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE, 
             text=True, 
-            encoding='utf-8'
+            encoding='utf-8',
+            close_fds=False
         )
         content, stderr = preproc_proc.communicate()
 
@@ -581,27 +955,205 @@ def process_c_file(file_path: Path, literate_c_script: Path) -> str:
         debug_print(f"  [Debug] Using simple markdown for {file_path} due to error: {e}")
         return markdown_content
 
-def prepare_pandoc_input(file_path: Path, literate_c_script: Path) -> str:
+def prepare_pandoc_input(file_path: Path, literate_c_script: Path, file_content: Optional[str] = None) -> str:
     """
     Prepares the content of a source file for Pandoc conversion based on its type.
     
-    Selects the appropriate processing function for the given file, converting it to Markdown or HTML as needed for Pandoc input. Supports Markdown, Python, shell scripts, Jupyter notebooks, Makefiles, and C/C++ files.
+    Selects the appropriate processing function for the given file, converting it to Markdown or HTML as needed for Pandoc input. Supports Markdown, Python, shell scripts, Jupyter notebooks, Makefiles, and C/C++ files. Callers that already hold the file text can pass it as file_content to avoid reading the file again.
     """
     file_suffix = file_path.suffix.lower()
     file_name = file_path.name
     
     if file_suffix == '.md':
-        return process_markdown_file(file_path)
+        return process_markdown_file(file_path, file_content)
     elif file_suffix == '.py':
-        return process_python_file(file_path)
+        return process_python_file(file_path, file_content)
     elif file_suffix == '.sh':
-        return process_shell_file(file_path)
+        return process_shell_file(file_path, file_content)
     elif file_suffix == '.ipynb':
-        return process_jupyter_notebook(file_path)
+        return process_jupyter_notebook(file_path, file_content)
     elif file_name == 'Makefile':
-        return process_shell_file(file_path)
+        return process_shell_file(file_path, file_content)
     else:  # C/C++ files
-        return process_c_file(file_path, literate_c_script)
+        return process_c_file(file_path, literate_c_script, file_content)
+
+def start_pandoc_server() -> Optional[subprocess.Popen]:
+    """
+    Starts a long-lived `pandoc server` so pages can be converted without spawning pandoc per file.
+    
+    Returns:
+        The running server process, or None if pandoc is missing or was built without server support.
+    """
+    global PANDOC_SERVER_URL
+    pandoc_bin = shutil.which('pandoc')
+    if not pandoc_bin:
+        return None
+    
+    # Reserve a free port; pandoc server does not report an ephemeral one
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    try:
+        process = subprocess.Popen([pandoc_bin, 'server', '--port', str(port), '--timeout', '60'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=False)
+    except OSError as e:
+        debug_print(f"  [Debug Pandoc] Could not start pandoc server: {e}")
+        return None
+    
+    # Wait until the server accepts connections
+    deadline = time.monotonic() + PANDOC_SERVER_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            debug_print("  [Debug Pandoc] pandoc server exited, falling back to pandoc per file")
+            return None
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            PANDOC_SERVER_URL = f"http://127.0.0.1:{port}/"
+            print(f"Using pandoc server at {PANDOC_SERVER_URL}")
+            return process
+        except OSError:
+            time.sleep(0.05)
+    
+    stop_pandoc_server(process)
+    return None
+
+def stop_pandoc_server(process: Optional[subprocess.Popen]) -> None:
+    """
+    Stops a pandoc server started by start_pandoc_server.
+    
+    Args:
+        process: The server process, or None if no server was started.
+    """
+    global PANDOC_SERVER_URL, _PANDOC_SERVER_CONNECTION
+    PANDOC_SERVER_URL = None
+    if _PANDOC_SERVER_CONNECTION is not None:
+        _PANDOC_SERVER_CONNECTION.close()
+        _PANDOC_SERVER_CONNECTION = None
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def _pandoc_server_connection(server_url: str) -> http.client.HTTPConnection:
+    """
+    Returns the keep-alive connection of the current process to the pandoc server, opening it if needed.
+    
+    Args:
+        server_url: URL of the running pandoc server.
+    
+    Returns:
+        An HTTP connection to the server.
+    """
+    global _PANDOC_SERVER_CONNECTION
+    url = urllib.parse.urlsplit(server_url)
+    connection = _PANDOC_SERVER_CONNECTION
+    if connection is None or (connection.host, connection.port) != (url.hostname, url.port):
+        if connection is not None:
+            connection.close()
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=120)
+        _PANDOC_SERVER_CONNECTION = connection
+    return connection
+
+def convert_with_pandoc_server(server_url: str, pandoc_input: str, template_path: Path,
+                               variables: Dict[str, str],
+                               from_format: str = 'markdown+smart+raw_html+tex_math_dollars') -> Optional[str]:
+    """
+    Converts Markdown to standalone HTML through the pandoc server JSON API.
+    
+    Requests reuse one keep-alive connection per process, so a worker does not open a new TCP connection per page.
+    
+    Args:
+        server_url: URL of the running pandoc server.
+        pandoc_input: Markdown content to convert.
+        template_path: Path to the Pandoc HTML template.
+        variables: Template variables, as passed with -V on the command line.
+        from_format: Pandoc input format, as passed with -f on the command line.
+    
+    Returns:
+        The generated HTML, or None if the server could not be used.
+    """
+    global _PANDOC_SERVER_CONNECTION
+    request_body = {
+        'text': pandoc_input,
+        'from': from_format,
+        'to': 'html5',
+        'standalone': True,
+        'html-math-method': 'mathjax',
+        'template': _read_template(str(template_path), template_path.stat().st_mtime_ns),
+        'variables': variables,
+    }
+    body = json.dumps(request_body).encode('utf-8')
+    headers = {'Content-Type': 'application/json', 'Accept': 'text/plain'}
+    path = urllib.parse.urlsplit(server_url).path or '/'
+    
+    # A kept-alive connection may have been closed by the server; retry once on a fresh one
+    for attempt in range(2):
+        connection = _pandoc_server_connection(server_url)
+        try:
+            connection.request('POST', path, body=body, headers=headers)
+            response = connection.getresponse()
+            content = response.read().decode('utf-8')
+        except (http.client.HTTPException, OSError) as e:
+            connection.close()
+            _PANDOC_SERVER_CONNECTION = None
+            if attempt == 0:
+                continue
+            debug_print(f"  [Debug Pandoc] pandoc server unavailable: {e}")
+            return None
+        if response.status != 200:
+            print(f"Error running pandoc server: {content}")
+            return None
+        return content
+    return None
+
+def pandoc_convert(pandoc_input: str, template_path: Path, variables: Dict[str, str],
+                   from_format: str = 'markdown+smart+raw_html+tex_math_dollars') -> Optional[str]:
+    """
+    Converts Markdown to a standalone HTML page, through the pandoc server when one is running.
+    
+    Falls back to a pandoc process when no server is running or the server cannot be used; without -o the page is read from its stdout.
+    
+    Args:
+        pandoc_input: Markdown content to convert.
+        template_path: Path to the Pandoc HTML template.
+        variables: Template variables, as passed with -V on the command line.
+        from_format: Pandoc input format, as passed with -f on the command line.
+    
+    Returns:
+        The generated HTML, or None if pandoc fails.
+    """
+    if PANDOC_SERVER_URL:
+        content = convert_with_pandoc_server(PANDOC_SERVER_URL, pandoc_input, template_path, variables, from_format)
+        if content is not None:
+            return content
+    
+    pandoc_cmd = [
+        PANDOC_BIN,
+        '-f', from_format,
+        '-t', 'html5',
+        '--standalone',
+        '--mathjax',
+        '--template', str(template_path),
+    ]
+    for name, value in variables.items():
+        pandoc_cmd.extend(['-V', f'{name}={value}'])
+    
+    debug_print(f"  [Debug Pandoc] Command: {' '.join(pandoc_cmd)}")
+    
+    process = subprocess.run(pandoc_cmd, input=pandoc_input, text=True, close_fds=False,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    
+    debug_print(f"  [Debug Pandoc] Return Code: {process.returncode}")
+    if process.stderr: debug_print(f"  [Debug Pandoc] STDERR:\n{process.stderr}")
+    
+    if process.returncode != 0:
+        print(f"Error running pandoc: {process.stderr}")
+        return None
+    return process.stdout
 
 def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path, 
                base_url: str, wiki_title: str, page_url: str, page_title: str,
@@ -610,13 +1162,13 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
     """
                Converts Markdown input to standalone HTML using Pandoc.
                
-               Runs Pandoc with a custom template and variables for SEO metadata, repository info, and asset paths to generate an HTML file from Markdown input. Handles SEO metadata and fixes malformed meta description tags. Returns Pandoc's standard output as a string.
+               Runs Pandoc with a custom template and variables for SEO metadata, repository info, and asset paths to generate an HTML page from Markdown input. Handles SEO metadata and fixes malformed meta description tags. The page is returned as a string; nothing is written to disk here.
                
                Note: HTML cleaning (removal of empty anchor tags) is now handled by the separate clean_html.py script.
                
                Args:
                    pandoc_input: Markdown content to convert.
-                   output_html_path: Path to write the generated HTML file.
+                   output_html_path: Path the generated HTML page will be written to.
                    template_path: Path to the Pandoc HTML template.
                    base_url: Base URL for the documentation site.
                    wiki_title: Title of the wiki or documentation set.
@@ -627,7 +1179,7 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
                    source_path: Optional source file path for reference.
                
                Returns:
-                   The standard output from the Pandoc process as a string, or an empty string if Pandoc fails.
+                   The generated HTML page as a string, or an empty string if Pandoc fails.
                """
     if seo_metadata is None:
         seo_metadata = {}
@@ -635,93 +1187,108 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
     # Determine if this is for a shell script file
     is_shell_script = output_html_path.name.endswith('.sh.html') or output_html_path.name == 'Makefile.html'
     
-    pandoc_cmd = [
-        'pandoc',
-        '-f', 'markdown+smart+raw_html+tex_math_dollars',
-        '-t', 'html5',
-        '--standalone',
-        '--mathjax',
-        '--template', str(template_path),
-        '-V', f'base={base_url}',
-        '-V', f'wikititle={wiki_title}',
-        '-V', f'pageUrl={page_url}',
-        '-V', f'pagetitle={page_title}',
-        '-V', f'reponame={REPO_NAME}',
-        '-V', f'description={seo_metadata.get("description", "")}',
-        '-V', f'keywords={seo_metadata.get("keywords", "")}',
-        '-V', f'image={seo_metadata.get("image", "")}',
-        '-V', f'asset_path_prefix={asset_path_prefix}',
-        '-V', f'repo_name={REPO_NAME}',
-        '-V', f'source_path={source_path if source_path else ""}',
-    ]
+    variables = {
+        'base': base_url,
+        'wikititle': wiki_title,
+        'pageUrl': page_url,
+        'pagetitle': page_title,
+        'reponame': REPO_NAME,
+        'description': seo_metadata.get("description", ""),
+        'keywords': seo_metadata.get("keywords", ""),
+        'image': seo_metadata.get("image", ""),
+        'asset_path_prefix': asset_path_prefix,
+        'repo_name': REPO_NAME,
+        'source_path': source_path if source_path else "",
+    }
     
     # For shell scripts and Jupyter notebooks, explicitly set mathjax to null to avoid template variable conflicts
     is_jupyter_html = output_html_path.name.endswith('.ipynb.html')
     if is_shell_script or is_jupyter_html:
-        pandoc_cmd.extend(['-V', 'mathjax=null'])
-        
-    pandoc_cmd.extend(['-o', str(output_html_path)])
+        variables['mathjax'] = 'null'
     
-    debug_print(f"  [Debug Pandoc] Command: {' '.join(pandoc_cmd)}")
     debug_print(f"  [Debug Pandoc] Input content length: {len(pandoc_input)} chars")
     
-    process = subprocess.run(pandoc_cmd, input=pandoc_input, text=True, capture_output=True)
-    
-    debug_print(f"  [Debug Pandoc] Return Code: {process.returncode}")
-    if process.stdout: debug_print(f"  [Debug Pandoc] STDOUT:\n{process.stdout}")
-    if process.stderr: debug_print(f"  [Debug Pandoc] STDERR:\n{process.stderr}")
-    
-    if process.returncode != 0:
-        print(f"Error running pandoc: {process.stderr}")
+    content = pandoc_convert(pandoc_input, template_path, variables)
+    if content is None:
         return ""
     
-    try:
-        with open(output_html_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Fix any malformed meta description tags, especially for Jupyter notebooks
-        desc_meta_pattern = r'<meta\s+name="description"\s+content="([^"]*(?:target|href|class|style|onclick)[^"]*)"[^>]*>'
-        if re.search(desc_meta_pattern, content):
-            print(f"  Fixing malformed meta description tag in {output_html_path.name}")
-            # Remove the problematic description meta tags
-            content = re.sub(desc_meta_pattern, '', content)
+    # Fix any malformed meta description tags, especially for Jupyter notebooks.
+    # The description can only come out malformed if it contains attribute-like words.
+    if _MALFORMED_DESC_TRIGGER_RE.search(variables['description']) and _MALFORMED_DESC_META_RE.search(content):
+        print(f"  Fixing malformed meta description tag in {output_html_path.name}")
+        # Remove the problematic description meta tags
+        content = _MALFORMED_DESC_META_RE.sub('', content)
+        
+        # Add a clean description meta tag in the head section if we have a description
+        if seo_metadata and "description" in seo_metadata and seo_metadata["description"]:
+            # Extra sanitization to be absolutely safe
+            clean_desc = _HTML_TAG_RE.sub('', seo_metadata.get("description", ""))
+            clean_desc = _DESC_UNSAFE_CHARS_RE.sub('', clean_desc)
+            clean_desc = html.escape(clean_desc)
             
-            # Add a clean description meta tag in the head section if we have a description
-            if seo_metadata and "description" in seo_metadata and seo_metadata["description"]:
-                # Extra sanitization to be absolutely safe
-                clean_desc = re.sub(r'<[^>]*>', '', seo_metadata.get("description", ""))
-                clean_desc = re.sub(r'["\'<>\\\]', '', clean_desc)
-                clean_desc = html.escape(clean_desc)
-                
-                head_pos = content.find('</head>')
-                if head_pos > 0:
-                    meta_tag = f'  <meta name="description" content="{clean_desc}">\n  '
-                    content = content[:head_pos] + meta_tag + content[head_pos:]
-        
-        # Check if file has proper HTML structure
-        if '<!DOCTYPE' not in content or '<html' not in content:
-            print(f"Warning: Generated HTML for {output_html_path} is missing DOCTYPE or html tag")
-            fixed_content = f"""<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
-    <title>{wiki_title} - {page_title}</title>
-    <meta name="description" content="{seo_metadata.get('description', '')}" />
-    <meta name="keywords" content="{seo_metadata.get('keywords', '')}" />
-</head>
-<body>
-{content}
-</body>
-</html>"""
-            content = fixed_content
-            
-        with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-            
-    except Exception as e:
-        print(f"Error verifying HTML structure: {e}")
+            head_pos = content.find('</head>')
+            if head_pos > 0:
+                meta_tag = f'  <meta name="description" content="{clean_desc}">\n  '
+                content = content[:head_pos] + meta_tag + content[head_pos:]
     
-    return process.stdout
+    return content
+
+def strip_dynamic_path_scripts(html_content: str) -> str:
+    """
+    Removes the dynamic base path and asset path scripts from an HTML page.
+    
+    The current template no longer emits these scripts, so a plain substring probe decides whether the regex pass is needed at all.
+    
+    Args:
+        html_content: The HTML content to clean.
+    
+    Returns:
+        The HTML content without the dynamic path scripts.
+    """
+    if not any(marker in html_content for marker in _DYN_JS_MARKERS):
+        return html_content
+    return _STRIP_DYN_JS_RE.sub('', html_content)
+
+def _wrap_pre_code(match: re.Match) -> str:
+    """
+    Wraps a matched <pre><code> HTML block in a container div for styling.
+    
+    Args:
+        match: A match of _PRE_CODE_RE.
+    
+    Returns:
+        The HTML block wrapped in a div with class "code-block-container".
+    """
+    return f'<div class="code-block-container">{match.group(0)}</div>'
+
+def _wrap_source_code(match: re.Match) -> str:
+    """
+    Wraps matched source code in a div container for styling.
+    
+    Args:
+        match: A match of _SOURCECODE_DIV_RE, with the code block as group 1.
+    
+    Returns:
+        The code block wrapped in a div with class "code-block-container".
+    """
+    return f'<div class="code-block-container">{match.group(1)}</div>'
+
+def _fix_doc_link(match: re.Match) -> str:
+    """
+    Appends '.html' to a local documentation link if missing.
+    
+    Links to source files (with extensions .c, .h, .py, .sh, .md) are updated to point to their corresponding HTML documentation, unless the link is external or an anchor.
+    
+    Args:
+        match: A match of _DOC_LINK_RE.
+    
+    Returns:
+        The anchor tag, with its href rewritten if needed.
+    """
+    href = match.group(2)
+    if href.startswith(('http', '#')) or not href.endswith(_SOURCE_EXTENSIONS):
+        return match.group(0)
+    return f'<a{match.group(1)}href="{href}.html">{match.group(3)}</a>'
 
 def post_process_python_shell_html(html_content: str) -> str:
     """
@@ -738,87 +1305,88 @@ def post_process_python_shell_html(html_content: str) -> str:
         The processed HTML content with enhanced formatting and navigation.
     """
     # Wrap code blocks with container divs
-    def wrap_pre_code(match):
-        """
-        Wraps a matched <pre><code> HTML block in a container div for styling.
-        
-        Args:
-            match: A regex match object containing a <pre><code> HTML block.
-        
-        Returns:
-            The HTML block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(0)}</div>'
-    
-    processed_html = re.sub(
-        r'<pre[^>]*><code[^>]*>.*?</code></pre>', 
-        wrap_pre_code, 
-        html_content, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    
-    def wrap_source_code(match):
-        """
-        Wraps matched source code in a div container for styling.
-        
-        Args:
-            match: A regex match object containing the code block as group 1.
-        
-        Returns:
-            The code block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(1)}</div>'
-    
-    processed_html = re.sub(
-        r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', 
-        wrap_source_code, 
-        processed_html, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    processed_html = _PRE_CODE_RE.sub(_wrap_pre_code, html_content)
+    processed_html = _SOURCECODE_DIV_RE.sub(_wrap_source_code, processed_html)
     
     # Fix links to docs by adding .html extension
-    def fix_doc_links(match):
-        """
-        Appends '.html' to local documentation links in HTML anchor tags if missing.
-        
-        This function is intended for use as a replacement callback in regular expression operations. It modifies anchor tags so that links to source files (with extensions .c, .h, .py, .sh, .md) are updated to point to their corresponding HTML documentation, unless the link is already external, an anchor, or already ends with '.html'.
-        """
-        link_tag = match.group(0)
-        href_match = re.search(r'href="([^"]+)"', link_tag)
-        
-        if href_match:
-            href = href_match.group(1)
-            if (href.startswith('http') or href.startswith('https') or 
-                href.startswith('#') or href.endswith('.html')):
-                return link_tag
-                
-            if re.search(r'\.(c|h|py|sh|md)$', href):
-                return re.sub(r'href="([^"]+)"', f'href="{href}.html"', link_tag)
-        
-        return link_tag
-    
-    processed_html = re.sub(
-        r'<a[^>]+href="[^"]+">[^<]+</a>',
-        fix_doc_links,
-        processed_html
-    )
+    processed_html = _DOC_LINK_RE.sub(_fix_doc_link, processed_html)
     
     # Remove dynamic path related scripts
-    processed_html = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', processed_html, flags=re.DOTALL)
+    processed_html = strip_dynamic_path_scripts(processed_html)
 
     # Add repoName variable
     repo_script = f'\n<script>window.repoName = "{REPO_NAME}";</script>\n'
-    processed_html = re.sub(r'<body[^>]*>', lambda m: m.group(0) + repo_script, processed_html)
+    # Pandoc emits a bare <body>; only fall back to the regex for other body tags
+    if '<body>' in processed_html:
+        processed_html = processed_html.replace('<body>', '<body>' + repo_script, 1)
+    else:
+        processed_html = _BODY_TAG_RE.sub(lambda m: m.group(0) + repo_script, processed_html, count=1)
 
     return processed_html
 
+@lru_cache(maxsize=64)
+def _read_decl_tags(path_str: str, mtime_ns: int) -> Dict[str, str]:
+    """
+    Reads the function declarations of a tags file, memoized on its path and modification time.
+    
+    Only "decl" entries are kept, mapping the line number (fourth field) to the declared name (second field), as decl_anchors.awk does.
+    
+    Args:
+        path_str: Path of the tags file as a string.
+        mtime_ns: Modification time of the file, so an edited file is read again.
+    
+    Returns:
+        A dictionary mapping line numbers to declaration names; empty if the file cannot be read.
+    """
+    decl = {}
+    try:
+        with open(path_str, 'rb') as f:
+            tags_content = f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return decl
+    for line in tags_content.splitlines():
+        fields = line.split()
+        if fields and fields[0] == 'decl':
+            decl[fields[3] if len(fields) > 3 else ''] = fields[1] if len(fields) > 1 else ''
+    return decl
+
+def apply_decl_anchors(html_content: str, decl: Dict[str, str]) -> str:
+    """
+    Adds line-number and declaration anchors to HTML generated from a C file.
+    
+    In-process port of decl_anchors.awk: every line holding only a line number becomes a self-referencing anchor, the first one being the line that ends with "<pre>1", followed by a span carrying the name of any function declared on that line.
+    
+    Args:
+        html_content: The HTML content to process.
+        decl: Declarations from the tags file, as returned by _read_decl_tags.
+    
+    Returns:
+        The HTML content with anchors added.
+    """
+    if not html_content:
+        return html_content
+    
+    def anchor_line(match):
+        if match.group('pre') is not None:
+            line_number = '1'
+            anchored = match.group('pre') + '<pre><a id="1" href="#1">1</a>'
+        else:
+            line_number = match.group('num')
+            anchored = f'<a id="{line_number}" href="#{line_number}">{line_number}</a>'
+        if decl.get(line_number):
+            anchored += f'<span id="{decl[line_number]}"/>'
+        return anchored
+    
+    # awk terminates every record with a newline, including the last one
+    body = html_content[:-1] if html_content.endswith('\n') else html_content
+    return _DECL_ANCHOR_LINE_RE.sub(anchor_line, body) + '\n'
+
 def run_awk_post_processing(html_content: str, file_path: Path, 
                            repo_root: Path, darcsit_dir: Path) -> str:
     """
-                           Runs an AWK script to add declaration anchors to HTML content generated from C files.
+                           Adds declaration anchors to HTML content generated from C files.
+                           
+                           Uses the in-process port of decl_anchors.awk, or runs the AWK script itself when --awk-decl-anchors is given.
                            
                            Args:
                                html_content: The HTML content to process.
@@ -830,109 +1398,80 @@ def run_awk_post_processing(html_content: str, file_path: Path,
                                The post-processed HTML content with declaration anchors added.
                            
                            Raises:
-                               FileNotFoundError: If the required AWK script is not found.
+                               FileNotFoundError: If the AWK script is requested but not found.
                                RuntimeError: If the AWK post-processing fails.
                            """
-    decl_anchors_script = darcsit_dir / 'decl_anchors.awk'
-    if not decl_anchors_script.is_file():
-        raise FileNotFoundError(f"decl_anchors.awk script not found at {decl_anchors_script}")
-    
     try:
         relative_tags_path = file_path.relative_to(repo_root).with_suffix(file_path.suffix + '.tags')
     except ValueError:
         print(f"Error: {file_path} is not under repository root {repo_root}")
         return html_content
-    temp_output_path = Path(f"{file_path}.temp.html")
     
-    try:
-        with open(temp_output_path, 'w', encoding='utf-8') as f_out:
-            postproc_cmd = ['awk', '-v', f'tags={relative_tags_path}', '-f', str(decl_anchors_script)]
-            postproc_proc = subprocess.Popen(
-                postproc_cmd, 
-                stdin=subprocess.PIPE, 
-                stdout=f_out, 
-                stderr=subprocess.PIPE, 
-                text=True, 
-                encoding='utf-8'
-            )
-            _, stderr = postproc_proc.communicate(input=html_content)
-
-            if postproc_proc.returncode != 0:
-                raise RuntimeError(f"Awk post-processing failed: {stderr}")
-        
-        with open(temp_output_path, 'r', encoding='utf-8') as f:
-            processed_content = f.read()
-        
-        return processed_content
-    finally:
-        if temp_output_path.exists():
-            temp_output_path.unlink()
-
-def post_process_c_html(html_content: str, file_path: Path, 
-                      repo_root: Path, darcsit_dir: Path, docs_dir: Path) -> str:
-    """
-                      Post-processes HTML generated from C or C++ source files for enhanced documentation.
-                      
-                      Removes trailing line numbers, wraps code blocks in container divs for styling, and converts `#include` statements into links to local documentation or the Basilisk source if unavailable locally. Cleans out dynamic path resolution scripts and injects a JavaScript variable with the repository name into the HTML body.
-                      
-                      Note: HTML cleaning (removal of empty anchor tags) is now handled by the separate clean_html.py script.
-                      
-                      Args:
-                          html_content: The HTML content to process.
-                          file_path: Path to the original source file.
-                          repo_root: Path to the repository root.
-                          darcsit_dir: Path to the Darcsit directory.
-                          docs_dir: Path to the documentation output directory.
-                      
-                      Returns:
-                          The post-processed HTML content as a string.
-                      """
-    # Remove trailing line numbers
-    cleaned_html = re.sub(
-        r'(\s*(?:<span class="[^"]*">\s*\d+\s*</span>|\s+\d+)\s*)+(\s*</span>)', 
-        r'\2', 
-        html_content
-    )
+    if not USE_AWK_DECL_ANCHORS:
+        tags_path = str(relative_tags_path)
+        try:
+            tags_mtime = os.stat(tags_path).st_mtime_ns
+        except OSError:
+            tags_mtime = -1
+        return apply_decl_anchors(html_content, _read_decl_tags(tags_path, tags_mtime))
     
-    # Wrap code blocks with container divs
-    def wrap_pre_code(match):
-        """
-        Wraps a matched code block in a container div for styling.
-        
-        Args:
-            match: A regex match object representing a code block.
-        
-        Returns:
-            The HTML string with the code block wrapped in a div.
-        """
-        return f'<div class="code-block-container">{match.group(0)}</div>'
+    decl_anchors_script = darcsit_dir / 'decl_anchors.awk'
+    if not decl_anchors_script.is_file():
+        raise FileNotFoundError(f"decl_anchors.awk script not found at {decl_anchors_script}")
     
-    cleaned_html = re.sub(
-        r'<pre[^>]*><code[^>]*>.*?</code></pre>', 
-        wrap_pre_code, 
-        cleaned_html, 
-        flags=re.DOTALL | re.IGNORECASE
+    postproc_cmd = [AWK_BIN, '-v', f'tags={relative_tags_path}', '-f', str(decl_anchors_script)]
+    postproc_proc = subprocess.Popen(
+        postproc_cmd, 
+        stdin=subprocess.PIPE, 
+        stdout=subprocess.PIPE, 
+        stderr=subprocess.PIPE, 
+        text=True, 
+        encoding='utf-8',
+        close_fds=False
     )
+    processed_content, stderr = postproc_proc.communicate(input=html_content)
+
+    if postproc_proc.returncode != 0:
+        raise RuntimeError(f"Awk post-processing failed: {stderr}")
     
-    def wrap_source_code(match):
-        """
-        Wraps matched source code in a div container for styling.
-        
-        Args:
-            match: A regex match object containing the code block as group 1.
-        
-        Returns:
-            The code block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(1)}</div>'
+    return processed_content
+
+@lru_cache(maxsize=4)
+def _src_local_files(repo_root_str: str) -> frozenset:
+    """
+    Lists the files of the repository's src-local directory once, so include checks are set lookups.
     
-    cleaned_html = re.sub(
-        r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', 
-        wrap_source_code, 
-        cleaned_html, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    Args:
+        repo_root_str: Path of the repository root as a string.
     
+    Returns:
+        A frozenset of the file names in src-local; empty if the directory does not exist.
+    """
+    try:
+        with os.scandir(os.path.join(repo_root_str, 'src-local')) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+
+def post_process_c_html(html_content: str, file_path: Path, 
+                      repo_root: Path, darcsit_dir: Path, docs_dir: Path) -> str:
+    """
+                      Post-processes HTML generated from C or C++ source files for enhanced documentation.
+                      
+                      Removes trailing line numbers, wraps code blocks in container divs for styling, and converts `#include` statements into links to local documentation or the Basilisk source if unavailable locally. Cleans out dynamic path resolution scripts and injects a JavaScript variable with the repository name into the HTML body.
+                      
+                      Note: HTML cleaning (removal of empty anchor tags) is now handled by the separate clean_html.py script.
+                      
+                      Args:
+                          html_content: The HTML content to process.
+                          file_path: Path to the original source file.
+                          repo_root: Path to the repository root.
+                          darcsit_dir: Path to the Darcsit directory.
+                          docs_dir: Path to the documentation output directory.
+                      
+                      Returns:
+                          The post-processed HTML content as a string.
+                      """
     # Add links to #include statements
     def create_include_link(match):
         """
@@ -944,18 +1483,17 @@ def post_process_c_html(html_content: str, file_path: Path,
         Returns:
             An HTML anchor tag wrapping the original include span, linking to the appropriate documentation or source file.
         """
-        prefix = match.group(1)
-        span_tag_open = match.group(2)
-        filename = match.group(3)
-        span_tag_close = match.group(4)
+        prefix = match.group('inc_prefix')
+        span_tag_open = match.group('inc_open')
+        filename = match.group('inc_file')
+        span_tag_close = match.group('inc_close')
         
         original_span_tag = f'{span_tag_open}\"{filename}\"{span_tag_close}'
         
         check_filename = filename.split('/')[-1]
-        local_file_path = repo_root / 'src-local' / check_filename
         
-        if local_file_path.is_file():
-            target_html_path = (docs_dir / 'src-local' / check_filename).with_suffix(local_file_path.suffix + '.html')
+        if check_filename in _src_local_files(str(repo_root)):
+            target_html_path = docs_dir / 'src-local' / (check_filename + '.html')
             try:
                 relative_link = os.path.relpath(target_html_path, start=file_path.parent)
                 link_url = relative_link.replace('\\', '/')
@@ -969,46 +1507,82 @@ def post_process_c_html(html_content: str, file_path: Path,
         
         return f'{prefix}<a href="{link_url}" title="{link_title}">{original_span_tag}</a>'
     
-    include_pattern = r'(<span class="pp">#include\s*</span>)(<span class=\"im\">)(?:\"|&quot;)(.*?)(?:\"|&quot;)(</span>)'
-    cleaned_html = re.sub(include_pattern, create_include_link, cleaned_html, flags=re.DOTALL)
+    def rewrite_code(match):
+        """
+        Removes a trailing line number or links an #include statement.
+        
+        Args:
+            match: A match of _C_CODE_RE or of the code alternatives of _C_HTML_RE.
+        
+        Returns:
+            The rewritten HTML fragment.
+        """
+        if match.lastgroup == 'endspan':
+            return match.group('endspan')
+        return create_include_link(match)
+    
+    def rewrite_html(match):
+        """
+        Rewrites one match of _C_HTML_RE, wrapping code blocks in container divs for styling.
+        
+        Args:
+            match: A match of _C_HTML_RE.
+        
+        Returns:
+            The rewritten HTML fragment.
+        """
+        kind = match.lastgroup
+        if kind == 'srcwrap':
+            return f'<div class="code-block-container">{_C_HTML_RE.sub(rewrite_html, match.group("srcbody"))}</div>'
+        if kind == 'prewrap':
+            return f'<div class="code-block-container">{_C_CODE_RE.sub(rewrite_code, match.group(0))}</div>'
+        return rewrite_code(match)
+    
+    # Remove trailing line numbers, wrap code blocks and link #include statements in one pass
+    cleaned_html = _C_HTML_RE.sub(rewrite_html, html_content)
     
     # Remove script tags related to dynamic paths
-    cleaned_html = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', cleaned_html, flags=re.DOTALL)
+    cleaned_html = strip_dynamic_path_scripts(cleaned_html)
     
     # Add repoName variable
     repo_script = f'\n<script>window.repoName = "{REPO_NAME}";</script>\n'
-    cleaned_html = re.sub(r'<body[^>]*>', lambda m: m.group(0) + repo_script, cleaned_html)
+    # Pandoc emits a bare <body>; only fall back to the regex for other body tags
+    if '<body>' in cleaned_html:
+        cleaned_html = cleaned_html.replace('<body>', '<body>' + repo_script, 1)
+    else:
+        cleaned_html = _BODY_TAG_RE.sub(lambda m: m.group(0) + repo_script, cleaned_html, count=1)
     
     return cleaned_html
 
-def insert_css_link_in_html(html_file_path: Path, css_path: Path, is_root: bool = True) -> bool:
+def apply_css_link(content: str, css_name: str, is_root: bool = True, source_name: str = "page") -> str:
     """
-    Inserts a CSS link tag into the <head> section of an HTML file.
+    Inserts a CSS link tag into the <head> section of an HTML document held in memory.
     
-    If the <head> tag is missing, creates a minimal HTML structure with the CSS link included. Returns True on success, or False if an error occurs.
+    If the <head> tag is missing, creates a minimal HTML structure with the CSS link included.
+    
+    Args:
+        content: The HTML document.
+        css_name: File name of the stylesheet.
+        is_root: Whether the page sits next to the stylesheet rather than one directory below it.
+        source_name: Name of the page, used in debug messages.
+    
+    Returns:
+        The HTML document with the link inserted, or unchanged if it is already present.
     """
-    try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        css_name = str(Path(css_path).name)
-        css_link = f'<link href="{css_name}" rel="stylesheet" type="text/css" />' if is_root else \
-                  f'<link href="../{css_name}" rel="stylesheet" type="text/css" />'
-        
-        if f'link href="{css_name}"' in content or f'link href="../{css_name}"' in content:
-            return True
-        
-        head_end_idx = content.find('</head>')
-        if head_end_idx == -1:
-            head_start_idx = content.find('<head>')
-            if head_start_idx != -1:
-                modified_content = content[:head_start_idx + 6] + '\n    ' + css_link + content[head_start_idx + 6:]
-            else:
-                debug_print(f"Warning: No head tag found in {html_file_path}, creating complete HTML structure")
-                modified_content = f"""<!DOCTYPE html>
+    css_link = f'<link href="{css_name}" rel="stylesheet" type="text/css" />' if is_root else \
+              f'<link href="../{css_name}" rel="stylesheet" type="text/css" />'
+    
+    if f'link href="{css_name}"' in content or f'link href="../{css_name}"' in content:
+        return content
+    
+    if '</head>' in content:
+        return content.replace('</head>', '    ' + css_link + '\n    </head>', 1)
+    head_start_idx = content.find('<head>')
+    if head_start_idx != -1:
+        return content[:head_start_idx + 6] + '\n    ' + css_link + content[head_start_idx + 6:]
+    
+    debug_print(f"Warning: No head tag found in {source_name}, creating complete HTML structure")
+    return f"""<!DOCTYPE html>
 <html xmlns="http://www.w3.org/1999/xhtml">
 <head>
     <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
@@ -1018,29 +1592,29 @@ def insert_css_link_in_html(html_file_path: Path, css_path: Path, is_root: bool
 {content}
 </body>
 </html>"""
-        else:
-            modified_content = content[:head_end_idx] + '    ' + css_link + '\n    ' + content[head_end_idx:]
+
+def insert_css_link_in_html(html_file_path: Path, css_path: Path, is_root: bool = True) -> bool:
+    """
+    Inserts a CSS link tag into the <head> section of an HTML file.
+    
+    File-based wrapper around apply_css_link. Returns True on success, or False if an error occurs.
+    """
+    try:
+        content = _read_text(html_file_path)
+        
+        modified_content = apply_css_link(content, str(Path(css_path).name), is_root, str(html_file_path))
+        if modified_content is content:
+            return True
         
-        with open(html_file_path, 'w', encoding='utf-8') as f:
-            f.write(modified_content)
+        _write_text(html_file_path, modified_content)
         
         return True
     except Exception as e:
         print(f"Error inserting CSS link in {html_file_path}: {e}")
         return False
 
-def insert_javascript_in_html(html_file_path: Path) -> bool:
-    """
-    Inserts inline JavaScript into an HTML file to add copy-to-clipboard buttons on code blocks.
-    
-    Adds a "Copy" button to each code block container, enabling users to copy code snippets to the clipboard. If the HTML file lacks a <body> tag, a minimal HTML structure is created. Returns True if the script is inserted or already present, False on error.
-    """
-    try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # JS for copy functionality
-        copy_js = '''
+# Inline JavaScript that adds copy-to-clipboard buttons to code blocks
+COPY_BUTTON_JS = '''
 <script type="text/javascript">
 document.addEventListener('DOMContentLoaded', function() {
     // Add copy button to each code block container
@@ -1111,74 +1685,90 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 </script>
         '''
-        
-        if 'class="copy-button"' in content:
-            return True
-        
-        body_end_idx = content.find('</body>')
-        if body_end_idx == -1:
-            body_start_idx = content.find('<body>')
-            if body_start_idx != -1:
-                modified_content = content + copy_js
-            else:
-                debug_print(f"Warning: No body tag found in {html_file_path}, creating complete HTML structure")
-                modified_content = f"""<!DOCTYPE html>
+
+def apply_copy_button_js(content: str, source_name: str = "page") -> str:
+    """
+    Inserts the copy-to-clipboard script into an HTML document held in memory.
+    
+    Adds a "Copy" button to each code block container. If the document lacks a <body> tag, a minimal HTML structure is created around it.
+    
+    Args:
+        content: The HTML document.
+        source_name: Name of the page, used in debug messages.
+    
+    Returns:
+        The HTML document with the script inserted, or unchanged if it is already present.
+    """
+    if 'class="copy-button"' in content:
+        return content
+    
+    body_end_idx = content.find('</body>')
+    if body_end_idx != -1:
+        return content[:body_end_idx] + COPY_BUTTON_JS + content[body_end_idx:]
+    if content.find('<body>') != -1:
+        return content + COPY_BUTTON_JS
+    
+    debug_print(f"Warning: No body tag found in {source_name}, creating complete HTML structure")
+    return f"""<!DOCTYPE html>
 <html xmlns="http://www.w3.org/1999/xhtml">
 <head>
     <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
 </head>
 <body>
 {content}
-{copy_js}
+{COPY_BUTTON_JS}
 </body>
 </html>"""
-        else:
-            modified_content = content[:body_end_idx] + copy_js + content[body_end_idx:]
+
+def insert_javascript_in_html(html_file_path: Path) -> bool:
+    """
+    Inserts inline JavaScript into an HTML file to add copy-to-clipboard buttons on code blocks.
+    
+    File-based wrapper around apply_copy_button_js. Returns True if the script is inserted or already present, False on error.
+    """
+    try:
+        content = _read_text(html_file_path)
         
-        with open(html_file_path, 'w', encoding='utf-8') as f:
-            f.write(modified_content)
+        modified_content = apply_copy_button_js(content, str(html_file_path))
+        if modified_content is content:
+            return True
+        
+        _write_text(html_file_path, modified_content)
         
         return True
     except Exception as e:
         print(f"Error inserting JavaScript in {html_file_path}: {e}")
         return False
 
+def _escape_script_block(match: re.Match) -> str:
+    """
+    Replaces any potential anchor tags in an HTML code example with harmless placeholders.
+    """
+    return _EMPTY_A_RE.sub('/* anchor tag removed */', match.group(1))
+
+def sanitize_pandoc_input(input_content: str) -> str:
+    """
+    Pre-processes Pandoc input to prevent script-related issues in the output HTML.
+    Removes any malformed HTML constructs that could cause problems after conversion.
+    """
+    # Convert self-closing a tags to proper a tags to avoid malformed HTML after conversion
+    input_content = _SELF_CLOSING_A_RE.sub(r'<a\1></a>', input_content)
+    
+    # Escape or convert script blocks in code examples to avoid JavaScript syntax errors  
+    input_content = _HTML_FENCE_RE.sub(_escape_script_block, input_content)
+                          
+    return input_content
+
 def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, repo_root: Path, 
                                      basilisk_dir: Path, darcsit_dir: Path, template_path: Path, 
-                                     base_url: str, wiki_title: str, literate_c_script: Path, docs_dir: Path) -> bool:
+                                     base_url: str, wiki_title: str, literate_c_script: Path, docs_dir: Path,
+                                     asset_path_prefix: Optional[str] = None, page_url: Optional[str] = None) -> bool:
     """
                                      Converts a source file to an HTML documentation page with type-specific post-processing.
                                      
-                                     Handles copying Jupyter notebooks, prepares input for Pandoc conversion, extracts SEO metadata, and applies appropriate post-processing for Python, shell, Markdown, Jupyter, or C/C++ files. Inserts JavaScript for code block copy functionality. Returns True on success, False on error.
+                                     Handles copying Jupyter notebooks, prepares input for Pandoc conversion, extracts SEO metadata, and applies appropriate post-processing for Python, shell, Markdown, Jupyter, or C/C++ files. Inserts JavaScript for code block copy functionality. The asset path prefix and page URL are computed here unless already planned by plan_outputs. Returns True on success, False on error.
                                      """
     
-    # Function to ensure script tags are properly sanitized during the conversion process
-    def sanitize_pandoc_input(input_content: str) -> str:
-        """
-        Pre-processes Pandoc input to prevent script-related issues in the output HTML.
-        Removes any malformed HTML constructs that could cause problems after conversion.
-        """
-        # Convert self-closing a tags to proper a tags to avoid malformed HTML after conversion
-        input_content = re.sub(r'<a([^>]*)/>',
-                              r'<a\1></a>',
-                              input_content)
-        
-        # Escape or convert script blocks in code examples to avoid JavaScript syntax errors  
-        def escape_script_blocks(match):
-            html_content = match.group(1)
-            # Replace any potential anchor tags in script examples with harmless placeholders
-            html_content = re.sub(r'<a\s+[^>]*>\s*</a>',
-                                '/* anchor tag removed */',
-                                html_content)
-            return f"{html_content}"
-            
-        input_content = re.sub(r'```html(.*?)```',
-                              escape_script_blocks,
-                              input_content,
-                              flags=re.DOTALL)
-                              
-        return input_content
-    
     print(f"  Processing {file_path.relative_to(repo_root)} -> {output_html_path.relative_to(repo_root / 'docs')}")
 
     try:
@@ -1187,19 +1777,23 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         if is_jupyter_notebook:
             notebook_dest = output_html_path.parent / file_path.name
             try:
-                shutil.copy2(file_path, notebook_dest)
+                fast_copy(file_path, notebook_dest)
                 print(f"  Copied notebook {file_path.name} to {notebook_dest.relative_to(repo_root / 'docs')}")
             except Exception as e:
                 print(f"  Warning: Failed to copy notebook file: {e}")
         
+        # Read the source once; every reader below works on this text
+        file_content = _read_text(file_path)
+        
         # Prepare pandoc input
-        pandoc_input_content = prepare_pandoc_input(file_path, literate_c_script)
+        pandoc_input_content = prepare_pandoc_input(file_path, literate_c_script, file_content)
         
         # Apply additional pre-processing to sanitize input
         pandoc_input_content = sanitize_pandoc_input(pandoc_input_content)
         
         # Calculate relative URL path
-        page_url = (base_url + output_html_path.relative_to(repo_root / 'docs').as_posix()).replace('//', '/')
+        if page_url is None:
+            page_url = (base_url + output_html_path.relative_to(repo_root / 'docs').as_posix()).replace('//', '/')
         
         # Clean up page title
         page_title = file_path.relative_to(repo_root).as_posix().strip('- \t')
@@ -1211,13 +1805,14 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         seo_metadata = extract_seo_metadata(file_path, pandoc_input_content)
         
         # Calculate asset path prefix
-        asset_path_prefix = calculate_asset_prefix(output_html_path, docs_dir)
+        if asset_path_prefix is None:
+            asset_path_prefix = calculate_asset_prefix(output_html_path, docs_dir)
         
         # Get source path relative to repo root
         source_path = file_path.relative_to(repo_root).as_posix()
         
         # Run pandoc for conversion
-        pandoc_stdout = run_pandoc(
+        html_content = run_pandoc(
             pandoc_input_content, 
             output_html_path, 
             template_path, 
@@ -1235,31 +1830,23 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         is_shell_file = file_path.suffix.lower() == '.sh'
         is_markdown_file = file_path.suffix.lower() == '.md'
         
-        # Apply appropriate post-processing
+        if not html_content:
+            print(f"  Error processing {file_path}: pandoc produced no output")
+            return False
+        
+        # Apply appropriate post-processing; the page stays in memory until it is complete
         if is_python_file or is_shell_file or is_markdown_file or is_jupyter_notebook:
-            with open(output_html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            processed_html = post_process_python_shell_html(html_content)
-            
-            with open(output_html_path, 'w', encoding='utf-8') as f:
-                f.write(processed_html)
+            html_content = post_process_python_shell_html(html_content)
         else:
-            # For C/C++ files
-            with open(output_html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Use awk for post-processing
-            processed_html = run_awk_post_processing(html_content, file_path, repo_root, darcsit_dir)
-            
-            # Further post-process
-            cleaned_html = post_process_c_html(processed_html, file_path, repo_root, darcsit_dir, docs_dir)
-            
-            with open(output_html_path, 'w', encoding='utf-8') as f:
-                f.write(cleaned_html)
+            # For C/C++ files: add declaration anchors, then further post-process
+            html_content = run_awk_post_processing(html_content, file_path, repo_root, darcsit_dir)
+            html_content = post_process_c_html(html_content, file_path, repo_root, darcsit_dir, docs_dir)
         
         # Insert JavaScript for code blocks
-        insert_javascript_in_html(output_html_path)
+        html_content = apply_copy_button_js(html_content, str(output_html_path))
+        
+        # Write the finished page in one go
+        _write_text(output_html_path, html_content)
         
         return True
     
@@ -1267,6 +1854,92 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         print(f"  Error processing {file_path}: {e}")
         return False
 
+def plan_outputs(source_files: List[str]) -> List[tuple]:
+    """
+    Computes the output location of every source file once, before any page is built.
+    
+    Works on plain strings; Path objects are only created where a page is actually built. The plan is sorted by output directory so that files of the same directory are processed together.
+    
+    Args:
+        source_files: Source file paths returned by find_source_files.
+    
+    Returns:
+        A list of (source path, output HTML path, asset path prefix, page URL, cache key) tuples.
+    """
+    repo_root = str(REPO_ROOT)
+    docs_dir = str(DOCS_DIR)
+    plan = []
+    for file_path in source_files:
+        relative_path = os.path.relpath(file_path, repo_root)
+        output_html_path = os.path.join(docs_dir, relative_path + '.html')
+        asset_path_prefix = calculate_asset_prefix(output_html_path, docs_dir)
+        cache_key = relative_path.replace(os.sep, '/')
+        page_url = (BASE_URL + cache_key + '.html').replace('//', '/')
+        plan.append((file_path, output_html_path, asset_path_prefix, page_url, cache_key))
+    plan.sort(key=lambda entry: os.path.dirname(entry[1]))
+    return plan
+
+def init_build_worker(template_path: Path, pandoc_server_url: Optional[str], repo_name: str) -> None:
+    """
+    Initializes a worker process of the page build pool.
+    
+    Sets the state that main establishes at run time, so workers see the same values whether they are forked or spawned.
+    
+    Args:
+        template_path: Path to the Pandoc HTML template prepared by validate_config.
+        pandoc_server_url: URL of the pandoc server started by main, if any.
+        repo_name: Name of the repository, used in the generated pages.
+    """
+    global TEMPLATE_PATH, PANDOC_SERVER_URL, REPO_NAME
+    TEMPLATE_PATH = template_path
+    PANDOC_SERVER_URL = pandoc_server_url
+    REPO_NAME = repo_name
+
+def _build_pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Returns the multiprocessing context for the page build pool.
+    
+    Workers are started from a fork server where available, so they do not inherit the sockets, child processes
+    and caches main holds when the pool is created; init_build_worker passes them the run-time state they need.
+    
+    Returns:
+        The forkserver context, or the platform default where forkserver is not supported.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context()
+
+def build_one(file_path: Union[str, Path], output_html_path: Union[str, Path],
+              asset_path_prefix: Optional[str] = None, page_url: Optional[str] = None) -> bool:
+    """
+    Generates the HTML page for a single source file.
+    
+    Top-level wrapper around process_file_with_page2html_logic so it can be dispatched to a worker process set up by init_build_worker; every file is converted independently of the others.
+    
+    Args:
+        file_path: Path to the source file.
+        output_html_path: Path to write the generated HTML file.
+        asset_path_prefix: Relative path prefix for assets, as planned by plan_outputs.
+        page_url: URL of the page, as planned by plan_outputs.
+    
+    Returns:
+        True if the page was generated successfully, False otherwise.
+    """
+    return process_file_with_page2html_logic(
+        Path(file_path), 
+        Path(output_html_path), 
+        REPO_ROOT, 
+        BASILISK_DIR, 
+        DARCSIT_DIR, 
+        TEMPLATE_PATH, 
+        BASE_URL, 
+        WIKI_TITLE, 
+        LITERATE_C_SCRIPT,
+        DOCS_DIR,
+        asset_path_prefix,
+        page_url
+    )
+
 def convert_directory_tree_to_html(readme_content: str) -> str:
     """
     Converts a plain text directory tree block in README content into an HTML-formatted site map.
@@ -1279,8 +1952,13 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     Returns:
         The modified README content with the directory tree replaced by an HTML site map.
     """
-    tree_pattern = r'```\s*\n(├.*?\n.*?└.*?)\n```'
-    tree_match = re.search(tree_pattern, readme_content, re.DOTALL)
+    # A tree block opens with a fence followed only by whitespace and its first branch, so the search
+    # can start at the fence before the first branch character; without one there is no tree at all
+    first_branch = readme_content.find('├')
+    if first_branch < 0:
+        return readme_content
+    fence_pos = readme_content.rfind('```', 0, first_branch)
+    tree_match = _DIR_TREE_RE.search(readme_content, max(fence_pos, 0))
     
     if not tree_match:
         return readme_content
@@ -1289,8 +1967,8 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     
     html_structure = ['<div class="repository-structure">']
     
-    path_stack = []
-    prev_indent = -1
+    # Latest directory seen at each indent level; a file's parent is the entry one level up
+    parents = [""] * _TREE_MAX_DEPTH
     
     for line in tree_text.split('\n'):
         if not line.strip():
@@ -1304,7 +1982,7 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
             spaces_before_item = len(line) - len(line.lstrip(' '))
             indent_level = spaces_before_item // 4
         
-        clean_line = line.replace('├── ', '').replace('└── ', '').replace('│   ', '')
+        clean_line = line.translate(_TREE_SYMBOLS_DEL)
         
         parts = clean_line.strip().split(None, 1)
         path = parts[0]
@@ -1312,17 +1990,10 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
         
         is_dir = path.endswith('/')
         
-        if indent_level > prev_indent:
-            if path_stack and prev_indent >= 0:
-                path_stack.append(path_stack[-1])
-        elif indent_level < prev_indent:
-            for _ in range(prev_indent - indent_level):
-                if path_stack:
-                    path_stack.pop()
-        
-        indent = '  ' * indent_level
+        if indent_level >= len(parents):
+            parents.extend([""] * (indent_level + 1 - len(parents)))
         
-        item_html = f"{indent}* "
+        item_html = f"{_INDENT[indent_level] if indent_level < _TREE_MAX_DEPTH else '  ' * indent_level}* "
         
         if is_dir:
             dir_name = path.rstrip('/')
@@ -1331,12 +2002,9 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
             else:
                 item_html += f"**[{path}]({dir_name})** - {description}"
             
-            if len(path_stack) <= indent_level:
-                path_stack.append(dir_name)
-            else:
-                path_stack[indent_level] = dir_name
+            parents[indent_level] = dir_name
         else:
-            parent_path = path_stack[indent_level-1] if indent_level > 0 and path_stack else ""
+            parent_path = parents[indent_level-1] if indent_level > 0 else ""
             
             file_path = f"{parent_path}/{path}" if parent_path else path
             file_path = file_path.lstrip('/')
@@ -1344,7 +2012,6 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
             item_html += f"**[{path}]({file_path}.html)** - {description}"
         
         html_structure.append(item_html)
-        prev_indent = indent_level
     
     html_structure.append('</div>')
     
@@ -1353,46 +2020,121 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     
     return modified_content
 
-def generate_directory_index(directory_name: str, directory_path: Path, generated_files: Dict[Path, Path], docs_dir: Path, repo_root: Path) -> bool:
+def read_page_description(html_path: Union[str, Path], head_size: int = 16384) -> Optional[str]:
+    """
+    Reads the meta description of a generated HTML page.
+    
+    Only the start of the page is read, since the description sits in the <head>; the whole file is read only if the head does not end within it.
+    
+    Args:
+        html_path: Path of the HTML page.
+        head_size: Number of bytes to read first.
+    
+    Returns:
+        The stripped description, or None if the page has none.
+    """
+    with open(html_path, 'rb') as f:
+        head = f.read(head_size)
+        desc_match = _META_DESC_CONTENT_RE.search(head)
+        if desc_match is None and b'</head>' not in head:
+            desc_match = _META_DESC_CONTENT_RE.search(head + f.read())
+    if desc_match is None:
+        return None
+    return desc_match.group(1).decode('utf-8', errors='replace').strip()
+
+# Hole of the compiled directory index template that receives the page content
+_DIR_INDEX_CONTENT_HOLE = '$body$'
+
+@lru_cache(maxsize=8)
+def _dir_index_template(path_str: str, mtime_ns: int) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Compiles the page template for the directory index pages, memoized on its path and modification time.
+    
+    The dynamic path scripts are stripped and the template is split once around its placeholders, so a page
+    is rendered by joining the fixed text with its values. Placeholders that are always dropped (the tabs
+    block and leftover conditionals and variables) are removed here; the filled-in values are titles, links
+    and descriptions, which never contain the stripped scripts.
+    
+    Args:
+        path_str: Path of the template file as a string.
+        mtime_ns: Modification time of the file, so an edited file is read again.
+    
+    Returns:
+        The fixed text segments and, between each pair of them, the key of the value that goes there: one of
+        _DIR_INDEX_LITERALS, or _DIR_INDEX_CONTENT_HOLE for the page content.
+    """
+    template_content = strip_dynamic_path_scripts(_read_template(path_str, mtime_ns))
+    segments, holes = [], []
+    text_parts, pos = [], 0
+    for match in _DIR_INDEX_TEMPLATE_RE.finditer(template_content):
+        text_parts.append(template_content[pos:match.start()])
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'literal' or kind == 'content':
+            segments.append(''.join(text_parts))
+            holes.append(match.group(0) if kind == 'literal' else _DIR_INDEX_CONTENT_HOLE)
+            text_parts = []
+    text_parts.append(template_content[pos:])
+    segments.append(''.join(text_parts))
+    return tuple(segments), tuple(holes)
+
+def generate_directory_index(directory_name: str, directory_path: Path, directory_pages: List[Tuple[Path, Path]],
+                             docs_dir: Path, repo_root: Path,
+                             description_cache: Optional[Dict[str, List[Any]]] = None) -> bool:
     """
     Generates an index.html page for a directory, listing all generated documentation files.
     
-    Creates a directory index page that displays links to all HTML documentation files within the specified directory, including file descriptions extracted from meta tags. The output uses a template, formats the directory name for display, and includes file-type icons and descriptions. Returns True on success, or False if an error occurs.
+    Creates a directory index page that displays links to the HTML documentation files within the specified directory, given as the (source path, HTML path) pairs of the pages generated directly in it, including file descriptions extracted from meta tags. The output uses a template, formats the directory name for display, and includes file-type icons and descriptions. Descriptions of pages whose modification time is recorded in description_cache are taken from the cache instead of the page; the cache is updated in place. Returns True on success, or False if an error occurs.
     """
     try:
         index_path = directory_path / "index.html"
         
-        # Filter files in this directory
-        directory_files = {}
-        for original_path, html_path in generated_files.items():
-            if html_path.parent == directory_path and html_path.name != "index.html":
-                relative_original_path = original_path.relative_to(repo_root)
-                relative_html_path = html_path.relative_to(directory_path)
-                directory_files[html_path] = {
-                    "html_path": relative_html_path,
-                    "original_path": relative_original_path,
-                    "name": relative_original_path.name,
-                    "description": "",
-                }
-                
-        # Extract descriptions
-        for html_path, info in directory_files.items():
+        # Files in this directory
+        directory_files = []
+        for original_path, html_path in directory_pages:
+            relative_original_path = original_path.relative_to(repo_root)
+            relative_html_path = html_path.relative_to(directory_path)
+            directory_files.append({
+                "page_path": html_path,
+                "html_path": relative_html_path,
+                "original_path": relative_original_path,
+                "name": relative_original_path.name,
+                "sort_key": relative_original_path.name.lower(),
+                "description": "",
+            })
+            
+        # Extract descriptions; the reads are I/O bound, so larger directories read them concurrently
+        def extract_description(info):
+            html_path = info["page_path"]
             try:
-                html_content = html_path.read_text(encoding='utf-8')
-                desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html_content)
-                if desc_match:
-                    description = desc_match.group(1).strip()
+                if description_cache is None:
+                    description = read_page_description(html_path)
+                else:
+                    cache_key = html_path.relative_to(docs_dir).as_posix()
+                    mtime = os.stat(html_path).st_mtime_ns
+                    cached = description_cache.get(cache_key)
+                    if cached and cached[0] == mtime:
+                        description = cached[1]
+                    else:
+                        description = read_page_description(html_path)
+                        description_cache[cache_key] = [mtime, description]
+                if description:
                     if len(description) > 120:
                         description = description[:117] + "..."
                     info["description"] = description
             except Exception as e:
                 print(f"Error extracting description from {html_path}: {e}")
         
-        # Read template
-        template_path = TEMPLATE_PATH
+        if len(directory_files) < 4:
+            for info in directory_files:
+                extract_description(info)
+        else:
+            with ThreadPoolExecutor(max_workers=min(32, len(directory_files))) as executor:
+                list(executor.map(extract_description, directory_files))
+        
+        # Compile template; the result is memoized, so it is read and compiled once for all directories
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
+            segments, holes = _dir_index_template(str(TEMPLATE_PATH), os.stat(TEMPLATE_PATH).st_mtime_ns)
         except Exception as e:
             print(f"Error reading template: {e}")
             return False
@@ -1407,81 +2149,46 @@ def generate_directory_index(directory_name: str, directory_path: Path, generate
             formatted_dir_name = "Post-Processing Tools"
             
         # Create TOC content
-        toc_html = f"<h1>{formatted_dir_name}</h1>\n\n"
+        toc_parts = [f"<h1>{formatted_dir_name}</h1>\n\n"]
         
         if directory_files:
-            toc_html += '<div class="documentation-section">\n'
-            toc_html += '<table class="documentation-files">\n'
+            toc_parts.append('<div class="documentation-section">\n<table class="documentation-files">\n')
             
             # Sort files by name
-            sorted_files = sorted(directory_files.values(), key=lambda x: x['original_path'].name.lower())
+            sorted_files = sorted(directory_files, key=itemgetter('sort_key'))
             
             for info in sorted_files:
-                file_extension = info["original_path"].suffix.lower()
-                file_type_class = "file-other"
-                
-                if file_extension in [".c", ".h"]:
-                    file_type_class = "file-c"
-                elif file_extension in [".py"]:
-                    file_type_class = "file-python"
-                elif file_extension in [".ipynb"]:
-                    file_type_class = "file-jupyter"
-                    
-                file_name = info["name"]
+                toc_parts.append(_DIR_INDEX_ROW_TPL.format_map({
+                    "cls": _EXT_CLASS.get(info["original_path"].suffix.lower(), "file-other"),
+                    "href": info["html_path"],
+                    "name": info["name"],
+                    "desc": info["description"],
+                }))
                 
-                toc_html += f'<tr>\n'
-                toc_html += f'  <td class="file-icon"><span class="{file_type_class}"></span></td>\n'
-                toc_html += f'  <td class="file-link" style="padding-right: 2em;"><a href="{info["html_path"]}" class="doc-link-button">{file_name}</a></td>\n'
-                toc_html += f'  <td class="file-desc">{info["description"]}</td>\n'
-                toc_html += f'</tr>\n'
-                
-            toc_html += '</table>\n'
-            toc_html += '</div>\n'
+            toc_parts.append('</table>\n</div>\n')
         else:
-            toc_html += '<p>No documentation files found in this directory.</p>\n'
+            toc_parts.append('<p>No documentation files found in this directory.</p>\n')
+        toc_html = "".join(toc_parts)
             
-        # Replace template variables
-        page_title = f"{formatted_dir_name} | Documentation"
-        html_content = template_content
-        html_content = html_content.replace("$if(pagetitle)$$pagetitle$$endif$$if(wikititle)$ | $wikititle$$endif$", page_title)
-        html_content = html_content.replace(
-            "$if(description)$$description$$else$Computational fluid dynamics simulations using Basilisk C framework.$endif$", 
-            "Documentation for the CoMPhy-Lab computational fluid dynamics framework."
-        )
-        html_content = html_content.replace(
-            "$if(keywords)$$keywords$$else$fluid dynamics, CFD, Basilisk, multiphase flow, computational physics$endif$", 
-            f"fluid dynamics, CFD, Basilisk, {directory_name}, documentation"
-        )
-        html_content = html_content.replace("$if(reponame)$$reponame$$else$Documentation$endif$", REPO_NAME)
-        
-        # Replace asset prefix based on depth
-        asset_path_prefix = calculate_asset_prefix(index_path, docs_dir)
-        html_content = html_content.replace("$asset_path_prefix$", asset_path_prefix)
-        
-        # Handle conditional blocks
-        if "$if(tabs)$" in html_content:
-            html_content = re.sub(r'\$if\(tabs\)\$(.*?)\$tabs\$(.*?)\$endif\$', '', html_content, flags=re.DOTALL)
-        
-        # Replace main content
-        content_replacement = toc_html
-        html_content = re.sub(
-            r'<div class="page-content">\s*.*?\$body\$.*?</div>', 
-            f'<div class="page-content">\n{content_replacement}\n</div>', 
-            html_content, flags=re.DOTALL
-        )
-        
-        # Remove remaining template variables
-        html_content = re.sub(r'\$[a-zA-Z0-9_]+\$', '', html_content)
-        html_content = re.sub(r'\$if\([^)]+\)\$.*?\$endif\$', '', html_content, flags=re.DOTALL)
-        
-        # Clean up any dynamic path scripts
-        html_content = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', html_content, flags=re.DOTALL)
+        # Values of the template placeholders; the asset prefix depends on the depth
+        values = dict(zip(_DIR_INDEX_LITERALS, (
+            f"{formatted_dir_name} | Documentation",
+            "Documentation for the CoMPhy-Lab computational fluid dynamics framework.",
+            f"fluid dynamics, CFD, Basilisk, {directory_name}, documentation",
+            REPO_NAME,
+            calculate_asset_prefix(index_path, docs_dir),
+        )))
+        values[_DIR_INDEX_CONTENT_HOLE] = f'<div class="page-content">\n{toc_html}\n</div>'
+        
+        # Interleave the fixed template text with the values
+        html_parts = [segments[0]]
+        for hole, segment in zip(holes, segments[1:]):
+            html_parts.append(values[hole])
+            html_parts.append(segment)
+        html_content = "".join(html_parts)
 
         # Write the HTML file
-        index_path.write_text(html_content, encoding='utf-8')
+        _write_text(index_path, html_content)
         print(f"Generated index page for directory: {directory_name}")
         return True
         
@@ -1528,7 +2235,7 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
     readme_content = convert_directory_tree_to_html(readme_content)
 
     # Add documentation links section
-    links_markdown = "\n\n## Generated Documentation\n\n"
+    links_parts = ["\n\n## Generated Documentation\n\n"]
     
     # Group links by top-level directory
     grouped_links = {}
@@ -1545,19 +2252,15 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
 
     # Add root directory section
     if 'root' in grouped_links and grouped_links['root']:
-        links_markdown += f"### Root Directory\n\n"
-        links_markdown += "\n".join(sorted(grouped_links['root']))
-        links_markdown += "\n\n"
+        links_parts.extend(("### Root Directory\n\n", "\n".join(sorted(grouped_links['root'])), "\n\n"))
     
     # Add sections for source directories
     for top_dir in sorted(grouped_links.keys()):
         if top_dir in SOURCE_DIRS:
-            links_markdown += f"### {top_dir}\n\n"
-            links_markdown += "\n".join(sorted(grouped_links[top_dir]))
-            links_markdown += "\n\n"
+            links_parts.extend((f"### {top_dir}\n\n", "\n".join(sorted(grouped_links[top_dir])), "\n\n"))
 
     # Append links to the end
-    final_readme_content = readme_content + links_markdown
+    final_readme_content = readme_content + "".join(links_parts)
 
     # Convert to HTML for index.html
     print(f"Generating index.html with REPO_NAME={REPO_NAME}")
@@ -1565,46 +2268,38 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
     # Use "." as asset path prefix for main index
     asset_path_prefix = "."
     
-    pandoc_cmd = [
-        'pandoc',
-        '-f', 'markdown+tex_math_dollars+raw_html',
-        '-t', 'html5',
-        '--standalone',
-        '--mathjax',
-        '--template', str(TEMPLATE_PATH),
-        '-V', f'wikititle={WIKI_TITLE}',
-        '-V', f'reponame={REPO_NAME}',
-        '-V', 'base=/',
-        '-V', 'notitle=true',
-        '-V', f'pagetitle={WIKI_TITLE}',
-        '-V', f'asset_path_prefix={asset_path_prefix}',
-        '-o', str(index_path)
-    ]
+    index_format = 'markdown+tex_math_dollars+raw_html'
+    variables = {
+        'wikititle': WIKI_TITLE,
+        'reponame': REPO_NAME,
+        'base': '/',
+        'notitle': 'true',
+        'pagetitle': WIKI_TITLE,
+        'asset_path_prefix': asset_path_prefix,
+    }
 
     debug_print(f"  [Debug Index] Target path: {index_path}")
-    debug_print(f"  [Debug Index] Command: {' '.join(pandoc_cmd)}")
 
-    process = subprocess.run(pandoc_cmd, input=final_readme_content, text=True, capture_output=True, check=False)
-
-    if process.returncode != 0:
-        print(f"Error generating index.html: {process.stderr}")
+    # The page is finished in memory and written once
+    index_html_content = pandoc_convert(final_readme_content, TEMPLATE_PATH, variables, index_format)
+    if index_html_content is None:
+        print("Error generating index.html")
         return False
     
     # Post-process index.html for code blocks
     try:
-        with open(index_path, 'r', encoding='utf-8') as f_in:
-            index_html_content = f_in.read()
-        
-        processed_html = post_process_python_shell_html(index_html_content)
-        
-        with open(index_path, 'w', encoding='utf-8') as f_out:
-            f_out.write(processed_html)
-            
+        index_html_content = post_process_python_shell_html(index_html_content)
     except Exception as e:
         print(f"Warning: Failed to process code blocks in {index_path}: {e}")
 
     # Insert JavaScript
-    insert_javascript_in_html(index_path)
+    index_html_content = apply_copy_button_js(index_html_content, str(index_path))
+    
+    try:
+        _write_text(index_path, index_html_content)
+    except Exception as e:
+        print(f"Error writing {index_path}: {e}")
+        return False
     
     return True
 
@@ -1621,10 +2316,7 @@ def generate_robots_txt(docs_dir: Path) -> bool:
     robots_path = docs_dir / 'robots.txt'
     
     try:
-        with open(robots_path, 'w', encoding='utf-8') as f:
-            f.write('User-agent: *\n')
-            f.write('Allow: /\n\n')
-            f.write(f'Sitemap: {BASE_DOMAIN}/sitemap.xml\n')
+        _write_text(robots_path, f'User-agent: *\nAllow: /\n\nSitemap: {BASE_DOMAIN}/sitemap.xml\n')
         
         debug_print(f"Generated robots.txt at {robots_path}")
         return True
@@ -1641,36 +2333,27 @@ def generate_sitemap(docs_dir: Path, generated_files: Dict[Path, Path]) -> bool:
     """
     sitemap_path = docs_dir / 'sitemap.xml'
     
+    url_template = '  <url>\n    <loc>{loc}</loc>\n    <changefreq>{changefreq}</changefreq>\n    <priority>{priority}</priority>\n  </url>\n'
+    
     try:
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
-            
-            # Add homepage
-            f.write('  <url>\n')
-            f.write(f'    <loc>{BASE_DOMAIN}/</loc>\n')
-            f.write('    <changefreq>weekly</changefreq>\n')
-            f.write('    <priority>1.0</priority>\n')
-            f.write('  </url>\n')
-            
-            # Add all HTML files
-            for _, html_path in generated_files.items():
-                relative_path = html_path.relative_to(docs_dir)
-                url_path = str(relative_path).replace('\\', '/')
-                
-                f.write('  <url>\n')
-                f.write(f'    <loc>{BASE_DOMAIN}/{url_path}</loc>\n')
-                f.write('    <changefreq>monthly</changefreq>\n')
-                
-                # Higher priority for important files
-                if 'index' in url_path or url_path.startswith('src-local/'):
-                    f.write('    <priority>0.8</priority>\n')
-                else:
-                    f.write('    <priority>0.6</priority>\n')
-                    
-                f.write('  </url>\n')
-            
-            f.write('</urlset>\n')
+        # Add homepage
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+            url_template.format(loc=f'{BASE_DOMAIN}/', changefreq='weekly', priority='1.0'),
+        ]
+        
+        # Add all HTML files
+        for _, html_path in generated_files.items():
+            url_path = html_path.relative_to(docs_dir).as_posix()
+            # Higher priority for important files
+            priority = '0.8' if 'index' in url_path or url_path.startswith('src-local/') else '0.6'
+            parts.append(url_template.format(loc=f'{BASE_DOMAIN}/{url_path}', changefreq='monthly', priority=priority))
+        
+        parts.append('</urlset>\n')
+        
+        # Write the sitemap in one go
+        _write_text(sitemap_path, ''.join(parts))
         
         debug_print(f"Generated sitemap at {sitemap_path}")
         return True
@@ -1691,13 +2374,28 @@ def copy_css_file(css_path: Path, docs_dir: Path) -> bool:
     	True if the file was copied successfully, False otherwise.
     """
     try:
-        shutil.copy2(css_path, docs_dir / css_path.name)
+        fast_copy(css_path, docs_dir / css_path.name)
         debug_print(f"Copied CSS file to {docs_dir / css_path.name}")
         return True
     except Exception as e:
         print(f"Error copying CSS file: {e}")
         return False
 
+def _iter_files(dir_path: Union[str, Path]):
+    """
+    Yields the directory entries of the regular files directly inside a directory.
+    
+    The file-type check reuses the information read with the directory listing, so no stat() is issued per entry
+    except for symlinks, which are followed like Path.is_file does.
+    
+    Args:
+        dir_path: Directory to list.
+    """
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            if entry.is_file():
+                yield entry
+
 def create_favicon_files(docs_dir: Path, logos_dir: Path) -> bool:
     """
     Creates favicon files and a web manifest in the documentation assets directory.
@@ -1718,10 +2416,11 @@ def create_favicon_files(docs_dir: Path, logos_dir: Path) -> bool:
         # Copy existing favicon files if available
         source_favicon_dir = Path(logos_dir.parent, "favicon")
         if source_favicon_dir.exists() and source_favicon_dir.is_dir():
-            for item in source_favicon_dir.glob('*'):
-                if item.is_file():
-                    shutil.copy2(item, favicon_dir / item.name)
-                    debug_print(f"Copied favicon file: {item.name}")
+            items = list(_iter_files(source_favicon_dir))
+            for item, error in zip(items, _copy_files([(item.path, favicon_dir / item.name) for item in items])):
+                if error is not None:
+                    raise error
+                debug_print(f"Copied favicon file: {item.name}")
         
         # Find logo file
         logo_file = None
@@ -1761,6 +2460,120 @@ def create_favicon_files(docs_dir: Path, logos_dir: Path) -> bool:
         print(f"Error creating favicon files: {e}")
         return False
 
+# ioctl request that makes a file share the data blocks of another on reflink-capable filesystems
+_FICLONE = 0x40049409
+
+def _copy_file_data(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copies the content of a file, letting the kernel do it without passing the bytes through userspace.
+    
+    Tries a reflink clone first (btrfs, XFS, overlay on top of them), then os.copy_file_range, which can copy
+    server-side on NFS and within the page cache elsewhere, then os.sendfile, which still copies in the kernel
+    on older kernels and filesystems that reject copy_file_range; if none of them works, falls back to
+    shutil.copyfile.
+    
+    Args:
+        src: Source file.
+        dst: Destination file; created or truncated.
+    """
+    # Opening the destination truncates it, so refuse to copy a file onto itself as shutil does
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError:
+                pass
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+                return
+            except OSError:
+                pass
+        if hasattr(os, 'sendfile'):
+            try:
+                # Start over in case copy_file_range wrote part of the file before failing
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                offset = 0
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+                    if sent == 0:
+                        return
+                    offset += sent
+            except OSError:
+                pass
+    shutil.copyfile(src, dst)
+
+def fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copies a file like shutil.copy2, using the kernel-side copy of _copy_file_data for the content.
+    
+    Args:
+        src: Source file.
+        dst: Destination file path.
+    """
+    _copy_file_data(src, dst)
+    shutil.copystat(src, dst)
+
+def _copy_files(pairs: List[Tuple[Path, Path]]) -> List[Optional[Exception]]:
+    """
+    Copies a batch of files with fast_copy, several at a time.
+    
+    The copies are small and bound by per-file syscall latency, so larger batches overlap them on a thread pool.
+    
+    Args:
+        pairs: (source, destination) paths to copy.
+    
+    Returns:
+        For each pair, in order, None if it was copied or the exception raised while copying it.
+    """
+    def copy_one(pair):
+        try:
+            fast_copy(pair[0], pair[1])
+            return None
+        except Exception as e:
+            return e
+    
+    if len(pairs) < 4:
+        return [copy_one(pair) for pair in pairs]
+    with ThreadPoolExecutor(max_workers=min(16, len(pairs))) as executor:
+        return list(executor.map(copy_one, pairs))
+
+def _fast_copytree(src: Path, dst: Path) -> None:
+    """
+    Recursively copies the files under src into dst, skipping up-to-date ones.
+    
+    Walks the tree with os.scandir and copies with _copy_file_data (which keeps the
+    bytes in the kernel where possible), then stamps the source times onto the
+    copy so a destination whose mtime is not older than its source is left alone on
+    the next run.
+    
+    Args:
+        src: Source directory.
+        dst: Destination directory; created if missing.
+    """
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            dst_path = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                _fast_copytree(entry.path, dst_path)
+            elif entry.is_file():
+                st = entry.stat()
+                try:
+                    if os.stat(dst_path).st_mtime_ns >= st.st_mtime_ns:
+                        continue
+                except FileNotFoundError:
+                    pass
+                _copy_file_data(entry.path, dst_path)
+                os.utime(dst_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+                debug_print(f"Copied {entry.path} to {dst_path}")
+
 def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
     """
     Copies all asset files (CSS, JavaScript, images, logos, and favicons) from the source assets directory to the documentation output directory, migrating legacy files and ensuring required assets are present.
@@ -1781,13 +2594,7 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         docs_css_dir.mkdir(exist_ok=True, parents=True)
         
         if css_dir.exists():
-            for css_file in css_dir.glob("**/*"):
-                if css_file.is_file():
-                    rel_path = css_file.relative_to(css_dir)
-                    dest_path = docs_css_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(css_file, dest_path)
-                    debug_print(f"Copied {css_file} to {dest_path}")
+            _fast_copytree(css_dir, docs_css_dir)
         
         # Copy JS files
         js_dir = assets_dir / "js"
@@ -1795,30 +2602,27 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         docs_assets_js_dir.mkdir(exist_ok=True, parents=True)
 
         if js_dir.exists():
-            for js_file in js_dir.glob("**/*"):
-                if js_file.is_file():
-                    rel_path = js_file.relative_to(js_dir)
-                    dest_path = docs_assets_js_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    try:
-                        shutil.copy2(js_file, dest_path)
-                        debug_print(f"Copied {js_file} to {dest_path}")
-                    except Exception as e:
-                        print(f"Error copying JS file {js_file}: {e}")
+            try:
+                _fast_copytree(js_dir, docs_assets_js_dir)
+            except Exception as e:
+                print(f"Error copying JS files from {js_dir}: {e}")
 
         # Handle legacy JS files
         legacy_js_dir = docs_dir / "js"
-        if legacy_js_dir.exists() and legacy_js_dir.is_dir():
-            for legacy_file in legacy_js_dir.glob("*"):
+        if legacy_js_dir.is_dir():
+            # One listing serves both the migration and the removal
+            with os.scandir(legacy_js_dir) as it:
+                legacy_entries = list(it)
+            for legacy_file in legacy_entries:
                 if legacy_file.is_file():
                     try:
-                        shutil.copy2(legacy_file, docs_assets_js_dir / legacy_file.name)
-                        debug_print(f"Migrated legacy JS file {legacy_file}")
+                        fast_copy(legacy_file.path, docs_assets_js_dir / legacy_file.name)
+                        debug_print(f"Migrated legacy JS file {legacy_file.path}")
                     except Exception as e:
-                        print(f"Error migrating legacy JS file {legacy_file}: {e}")
+                        print(f"Error migrating legacy JS file {legacy_file.path}: {e}")
             try:
-                for legacy_file in legacy_js_dir.glob("*"):
-                    legacy_file.unlink()
+                for legacy_file in legacy_entries:
+                    os.unlink(legacy_file.path)
                 legacy_js_dir.rmdir()
                 debug_print("Removed legacy docs/js directory.")
             except Exception as e:
@@ -1831,7 +2635,7 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
             dest_file = docs_assets_js_dir / req_file
             if not dest_file.exists() and src_file.exists():
                 try:
-                    shutil.copy2(src_file, dest_file)
+                    fast_copy(src_file, dest_file)
                     debug_print(f"Copied required JS file {src_file}")
                 except Exception as e:
                     print(f"Error copying required JS file {src_file}: {e}")
@@ -1841,34 +2645,20 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         docs_img_dir = docs_assets_dir / "images"
         
         if img_dir.exists():
-            docs_img_dir.mkdir(exist_ok=True, parents=True)
-            for img_file in img_dir.glob("**/*"):
-                if img_file.is_file():
-                    rel_path = img_file.relative_to(img_dir)
-                    dest_path = docs_img_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(img_file, dest_path)
-                    debug_print(f"Copied {img_file} to {dest_path}")
+            _fast_copytree(img_dir, docs_img_dir)
                     
         # Copy logos
         logos_dir = assets_dir / "logos"
         docs_logos_dir = docs_assets_dir / "logos"
         
         if logos_dir.exists():
-            docs_logos_dir.mkdir(exist_ok=True, parents=True)
-            for logo_file in logos_dir.glob("**/*"):
-                if logo_file.is_file():
-                    rel_path = logo_file.relative_to(logos_dir)
-                    dest_path = docs_logos_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(logo_file, dest_path)
-                    debug_print(f"Copied {logo_file} to {dest_path}")
+            _fast_copytree(logos_dir, docs_logos_dir)
         
         # Copy custom CSS to root
         if css_dir.exists():
             custom_styles_path = css_dir / "custom_styles.css"
             if custom_styles_path.exists():
-                shutil.copy2(custom_styles_path, docs_dir / "custom_styles.css")
+                fast_copy(custom_styles_path, docs_dir / "custom_styles.css")
                 debug_print(f"Copied custom_styles.css to root directory")
         
         # Create favicon files
@@ -1879,22 +2669,23 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         # Copy favicon files to root
         favicon_source_dir = assets_dir / "favicon"
         if favicon_source_dir.exists() and favicon_source_dir.is_dir():
-            for fav_file in favicon_source_dir.glob("*"):
-                if fav_file.is_file():
-                    shutil.copy2(fav_file, docs_dir / fav_file.name)
-                    debug_print(f"Copied {fav_file.name} to root")
+            fav_files = list(_iter_files(favicon_source_dir))
+            for fav_file, error in zip(fav_files, _copy_files([(fav_file.path, docs_dir / fav_file.name) for fav_file in fav_files])):
+                if error is not None:
+                    raise error
+                debug_print(f"Copied {fav_file.name} to root")
 
         # Copy Basilisk JS files
         static_js_dir = DARCSIT_DIR / "static" / "js"
         docs_assets_js_dir = docs_dir / "assets" / "js"
         docs_assets_js_dir.mkdir(exist_ok=True, parents=True)
         if static_js_dir.exists() and static_js_dir.is_dir():
-            for js_file in static_js_dir.glob("*.js"):
-                try:
-                    shutil.copy2(js_file, docs_assets_js_dir / js_file.name)
+            js_files = [entry for entry in _iter_files(static_js_dir) if entry.name.endswith(".js")]
+            for js_file, error in zip(js_files, _copy_files([(js_file.path, docs_assets_js_dir / js_file.name) for js_file in js_files])):
+                if error is None:
                     debug_print(f"Copied Basilisk JS file: {js_file.name}")
-                except Exception as e:
-                    print(f"Error copying Basilisk JS file {js_file}: {e}")
+                else:
+                    print(f"Error copying Basilisk JS file {js_file.path}: {error}")
 
         return True
     except Exception as e:
@@ -1905,11 +2696,21 @@ def main():
     """
     Generates the complete HTML documentation site for the project.
     
-    Creates the documentation output directory, optionally cleans existing HTML files if force rebuild is enabled, copies all required assets, processes each supported source file into HTML with appropriate post-processing, generates index pages for directories and the main index from README.md, and creates robots.txt and sitemap.xml for search engines. Also copies additional JavaScript files required for Basilisk integration and cleans up temporary files.
+    Creates the documentation output directory, optionally cleans existing HTML files if force rebuild is enabled, copies all required assets, processes each supported source file into HTML with appropriate post-processing, generates index pages for directories and the main index from README.md, and creates robots.txt and sitemap.xml for search engines. Also copies additional JavaScript files required for Basilisk integration.
     """
-    if not validate_config():
-        return
+    # The processed template lives in a temporary directory that is removed however the run ends
+    with tempfile.TemporaryDirectory(prefix='docsgen-') as temp_dir:
+        if not validate_config(Path(temp_dir)):
+            return
+        generate_site()
+
+def generate_site():
+    """
+    Builds the documentation site once validate_config has prepared the template.
     
+    Cleans existing HTML files if force rebuild is enabled, copies the assets, converts the source files, and writes the index pages, robots.txt, sitemap.xml and the Basilisk JavaScript files.
+    """
+    pandoc_server = None
     try:
         # Create docs directory
         DOCS_DIR.mkdir(exist_ok=True)
@@ -1917,9 +2718,15 @@ def main():
         # Clean docs if force-rebuild enabled
         if FORCE_REBUILD:
             print("\nForce rebuild enabled. Cleaning docs directory...")
-            for html_file in DOCS_DIR.rglob('*.html'):
+            # Pages only live in the source directory mirrors and at the top level, so only those
+            # are searched for .html files; everything else, and the assets tree, is left in place
+            html_files = [entry.path for entry in _iter_files(DOCS_DIR) if entry.name.endswith('.html')]
+            for source_dir in SOURCE_DIRS:
+                for dir_path, _, file_names in os.walk(DOCS_DIR / source_dir):
+                    html_files.extend(os.path.join(dir_path, name) for name in file_names if name.endswith('.html'))
+            for html_file in html_files:
                 try:
-                    html_file.unlink()
+                    os.unlink(html_file)
                     debug_print(f"Removed {html_file}")
                 except Exception as e:
                     print(f"Warning: Could not remove {html_file}: {e}")
@@ -1938,45 +2745,66 @@ def main():
             return
         
         # Dictionary for generated files
-        generated_files = {}
+        built_files = {}
         
-        # Process each file
-        for file_path in source_files:
-            # Create output path
-            relative_path = file_path.relative_to(REPO_ROOT)
-            output_html_path = DOCS_DIR / relative_path.with_suffix(relative_path.suffix + '.html')
-            
+        # Load the incremental build cache and persist it however the run ends
+        build_key = compute_build_key(TEMPLATE_PATH, LITERATE_C_SCRIPT, REPO_ROOT)
+        build_cache = {} if FORCE_REBUILD else load_build_cache(BUILD_CACHE_PATH, build_key)
+        atexit.register(save_build_cache, BUILD_CACHE_PATH, build_key, build_cache)
+        
+        # Collect the files that need to be (re)generated
+        pending = []
+        docs_dir = str(DOCS_DIR)
+        for file_path, output_html_path, asset_path_prefix, page_url, cache_key in plan_outputs(source_files):
             # Create output directory
-            output_html_path.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(os.path.dirname(output_html_path), exist_ok=True)
             
-            # Skip if not forced and file exists
-            if not FORCE_REBUILD and output_html_path.exists():
-                print(f"  Skipping existing file: {output_html_path.relative_to(DOCS_DIR)}")
-                generated_files[file_path] = output_html_path
+            # Skip if not forced and the source is unchanged since the last build
+            if (not FORCE_REBUILD and os.path.exists(output_html_path)
+                    and is_cached_build_current(file_path, build_cache.get(cache_key))):
+                print(f"  Skipping up-to-date file: {os.path.relpath(output_html_path, docs_dir)}")
+                built_files[file_path] = output_html_path
                 continue
             
-            # Process file
-            if process_file_with_page2html_logic(
-                file_path, 
-                output_html_path, 
-                REPO_ROOT, 
-                BASILISK_DIR, 
-                DARCSIT_DIR, 
-                TEMPLATE_PATH, 
-                BASE_URL, 
-                WIKI_TITLE, 
-                LITERATE_C_SCRIPT,
-                DOCS_DIR
-            ):
-                generated_files[file_path] = output_html_path
+            pending.append((file_path, output_html_path, asset_path_prefix, page_url, cache_key))
+        
+        # Process files in parallel; each one is an independent pandoc pipeline
+        if pending:
+            pandoc_server = start_pandoc_server()
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_build_pool_context(),
+                                     initializer=init_build_worker,
+                                     initargs=(TEMPLATE_PATH, PANDOC_SERVER_URL, REPO_NAME)) as executor:
+                results = executor.map(
+                    build_one,
+                    [file_path for file_path, _, _, _, _ in pending],
+                    [output_html_path for _, output_html_path, _, _, _ in pending],
+                    [asset_path_prefix for _, _, asset_path_prefix, _, _ in pending],
+                    [page_url for _, _, _, page_url, _ in pending],
+                    chunksize=4
+                )
+                for (file_path, output_html_path, _, _, cache_key), success in zip(pending, results):
+                    if success:
+                        built_files[file_path] = output_html_path
+                        build_cache[cache_key] = make_build_cache_entry(file_path)
+        
+        # Keep the generated files in source order for the index pages and sitemap
+        generated_files = {Path(f): Path(built_files[f]) for f in source_files if f in built_files}
         
         # Generate folder index pages
         print("\nGenerating folder index pages...")
+        description_cache = {} if FORCE_REBUILD else load_description_cache(DESCRIPTION_CACHE_PATH)
+        # Group the generated pages by output directory once, instead of scanning them all per directory
+        pages_by_dir = {}
+        for original_path, html_path in generated_files.items():
+            if html_path.name != "index.html":
+                pages_by_dir.setdefault(html_path.parent, []).append((original_path, html_path))
         for source_dir in SOURCE_DIRS:
             docs_source_dir = DOCS_DIR / source_dir
             if docs_source_dir.exists():
-                if not generate_directory_index(source_dir, docs_source_dir, generated_files, DOCS_DIR, REPO_ROOT):
+                if not generate_directory_index(source_dir, docs_source_dir, pages_by_dir.get(docs_source_dir, []),
+                                                DOCS_DIR, REPO_ROOT, description_cache):
                     print(f"Failed to generate index for {source_dir}.")
+        save_description_cache(DESCRIPTION_CACHE_PATH, description_cache)
         
         # Generate main index.html
         print("\nGenerating main index.html...")
@@ -1998,24 +2826,20 @@ def main():
         js_src_dir = BASILISK_DIR / 'src' / 'darcsit' / 'static' / 'js'
         js_dest_dir = DOCS_DIR / 'assets' / 'js'
         js_dest_dir.mkdir(parents=True, exist_ok=True)
+        js_pairs = []
         for js_file in ['jquery.min.js', 'jquery-ui.packed.js', 'plots.js']:
             src = js_src_dir / js_file
-            dst = js_dest_dir / js_file
             if src.exists():
-                shutil.copy2(src, dst)
-                print(f"Copied Basilisk JS file {src} to {dst}")
+                js_pairs.append((src, js_dest_dir / js_file))
             else:
                 print(f"Warning: Basilisk JS file {src} not found")
+        for (src, dst), error in zip(js_pairs, _copy_files(js_pairs)):
+            if error is not None:
+                raise error
+            print(f"Copied Basilisk JS file {src} to {dst}")
         
     finally:
-        # Clean up temporary template
-        temp_template_path = TEMPLATE_PATH.parent / (TEMPLATE_PATH.stem.replace('.temp', '') + '.temp.html')
-        if temp_template_path.exists():
-            try:
-                temp_template_path.unlink()
-                debug_print(f"Cleaned up temporary template file")
-            except Exception as e:
-                print(f"Warning: Could not delete temporary template file: {e}")
+        stop_pandoc_server(pandoc_server)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
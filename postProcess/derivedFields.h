@@ -0,0 +1,53 @@
+/**
+# Derived Fields for Post-processing
+
+Computes the fields plotted by the post-processing tools from a restored
+snapshot. `getData` and `getWorker` both include this header, so the two
+programs always output the same quantities.
+
+- D2c: Log10 of the second invariant of the strain rate tensor
+- vel: Velocity magnitude field
+
+The strain rate tensor components are computed using finite difference
+approximations of the velocity gradients.
+
+- Author: Vatsal Sanjay
+vatsalsanjay@gmail.com
+Physics of Fluids Department
+University of Twente
+
+*/
+
+/**
+### Field Computation
+
+- f: Volume fraction field
+- u: Velocity field
+- D2c: Output, log10 of the second invariant (-10 where it vanishes)
+- vel: Output, velocity magnitude
+*/
+void computeDerivedFields(scalar f, vector u, scalar D2c, scalar vel)
+{
+  foreach() {
+    // Calculate components of the strain rate tensor
+    double D11 = (u.y[0, 1] - u.y[0, -1])/(2 * Delta);
+    double D22 = (u.y[]/y);
+    double D33 = (u.x[1, 0] - u.x[-1, 0])/(2 * Delta);
+    double D13 = 0.5 * ((u.y[1, 0] - u.y[-1, 0] + u.x[0, 1] -
+                         u.x[0, -1])/(2 * Delta));
+
+    // Calculate the second invariant
+    double D2 = (sq(D11) + sq(D22) + sq(D33) + 2.0 * sq(D13));
+    D2c[] = f[] * sqrt(D2/2.0);
+
+    // Convert to log scale for better visualization
+    if (D2c[] > 0.) {
+      D2c[] = log(D2c[])/log(10);
+    } else {
+      D2c[] = -10;  // Floor value for zero or negative values
+    }
+
+    // Calculate velocity magnitude
+    vel[] = f[] * sqrt(sq(u.x[]) + sq(u.y[]));
+  }
+}
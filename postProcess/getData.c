@@ -35,6 +35,7 @@ making it valuable for visualizing coherent structures in turbulent flows.
 
 #include "utils.h"
 #include "output.h"
+#include "derivedFields.h"
 
 scalar f[];  // Volume fraction field
 vector u[];  // Velocity field
@@ -72,36 +73,14 @@ int main(int a, char const *arguments[])
 /**
 ## Data Processing
 
-Restores simulation data and calculates derived quantities at each point:
+Restores simulation data and calculates derived quantities at each point
+with `computeDerivedFields` (see derivedFields.h):
 
 - D2c: Log10 of the second invariant of the strain rate tensor
 - vel: Velocity magnitude field
-
-The strain rate tensor components are computed using finite difference
-approximations of the velocity gradients.
 */
   restore(file = filename);
-  foreach() {
-    // Calculate components of the strain rate tensor
-    double D11 = (u.y[0, 1] - u.y[0, -1])/(2 * Delta);
-    double D22 = (u.y[]/y);
-    double D33 = (u.x[1, 0] - u.x[-1, 0])/(2 * Delta);
-    double D13 = 0.5 * ((u.y[1, 0] - u.y[-1, 0] + u.x[0, 1] - u.x[0, -1])/(2 * Delta));
-    
-    // Calculate the second invariant
-    double D2 = (sq(D11) + sq(D22) + sq(D33) + 2.0 * sq(D13));
-    D2c[] = f[] * sqrt(D2/2.0);
-    
-    // Convert to log scale for better visualization
-    if (D2c[] > 0.) {
-      D2c[] = log(D2c[])/log(10);
-    } else {
-      D2c[] = -10;  // Floor value for zero or negative values
-    }
-
-    // Calculate velocity magnitude
-    vel[] = f[] * sqrt(sq(u.x[]) + sq(u.y[]));
-  }
+  computeDerivedFields(f, u, D2c, vel);
 
 /**
 ## Data Output
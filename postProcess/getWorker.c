@@ -0,0 +1,189 @@
+/**
+# Snapshot Worker
+
+A long-lived helper that serves both interface facets and interpolated
+field data for many simulation snapshots from a single process.
+
+## Description
+`getFacets` and `getData` each restore one snapshot and exit, so a video
+of N frames starts 2N processes and pays the program start-up every time.
+This worker reads one request per line on standard input and answers each
+on standard output, so a post-processing worker can keep one instance
+running for all of its snapshots.
+
+## Protocol
+
+Requests (one per line, paths without spaces):
+
+```
+F snapshot                         interface facets, as ./getFacets
+D snapshot xmin ymin xmax ymax ny  field data, as ./getData
+```
+
+Every reply is one frame: the payload size in bytes as a native-endian
+64-bit unsigned integer, followed by the payload. The facet payload is
+the text written by `output_facets`; the field payload is binary
+native-endian float32 records (x, y, D2c, vel per grid point, ordered by
+x, then y), the same grid `getData` writes as text. A snapshot that
+cannot be restored gets an empty frame. The worker exits at end of input.
+
+## Usage
+
+```
+qcc -O2 -Wall getWorker.c -o getWorker -lm
+```
+
+- Author: Vatsal Sanjay
+vatsalsanjay@gmail.com
+Physics of Fluids Department
+University of Twente
+
+*/
+
+#include <stdint.h>
+#include "utils.h"
+#include "output.h"
+#include "fractions.h"
+#include "derivedFields.h"
+
+scalar f[];  // Volume fraction field
+vector u[];  // Velocity field
+
+char filename[1024], restored[1024] = "";
+
+scalar D2c[], vel[];  // Derived fields
+scalar * list = NULL;  // List of fields to output
+
+/**
+### Snapshot Loading
+
+Restores a snapshot unless it is the one already loaded, since the
+facets and the field data of a frame are requested one after the other.
+Returns false if the snapshot cannot be restored; nothing is then marked
+as loaded, so a later request for the same file tries again.
+*/
+static bool loadSnapshot(const char * name)
+{
+  if (strcmp(name, restored) != 0) {
+    restored[0] = '\0';
+    if (!restore(file = (char *) name)) {
+      fprintf(stderr, "getWorker: cannot restore %s\n", name);
+      return false;
+    }
+    snprintf(restored, sizeof(restored), "%s", name);
+  }
+  return true;
+}
+
+/**
+### Framed Replies
+
+Writes one reply frame to standard output and flushes it, so the
+client can read it while the worker waits for the next request.
+*/
+static void sendFrame(const void * data, uint64_t size)
+{
+  fwrite(&size, sizeof(size), 1, stdout);
+  if (size > 0)
+    fwrite(data, 1, size, stdout);
+  fflush(stdout);
+}
+
+/**
+### Facets
+
+Writes the facets of the restored volume fraction field into memory
+and sends them as one frame.
+*/
+static void sendFacets()
+{
+  char * buffer = NULL;
+  size_t size = 0;
+  FILE * fp = open_memstream(&buffer, &size);
+  output_facets(f, fp);
+  fclose(fp);
+  sendFrame(buffer, size);
+  free(buffer);
+}
+
+/**
+### Field Data
+
+Computes the derived fields shared with `getData` (see derivedFields.h),
+interpolates them onto the regular grid, and sends the float records
+as one frame.
+*/
+static void sendField(double xmin, double ymin, double xmax, double ymax,
+                      int ny)
+{
+  computeDerivedFields(f, u, D2c, vel);
+
+  double Deltay = (double)((ymax - ymin)/(ny));
+  int nx = (int)((xmax - xmin)/Deltay);
+  double Deltax = (double)((xmax - xmin)/(nx));
+  int len = list_len(list);
+  int ncol = 2 + len;
+
+  float * records = (float *) malloc((size_t) nx * ny * ncol * sizeof(float));
+  if (records == NULL) {
+    fprintf(stderr, "getWorker: cannot allocate %d x %d grid for %s\n",
+            nx, ny, restored);
+    sendFrame(NULL, 0);
+    return;
+  }
+  size_t n = 0;
+  for (int i = 0; i < nx; i++) {
+    double x = Deltax * (i + 1./2) + xmin;
+    for (int j = 0; j < ny; j++) {
+      double y = Deltay * (j + 1./2) + ymin;
+      records[n++] = x;
+      records[n++] = y;
+      for (scalar s in list) {
+        records[n++] = interpolate(s, x, y);
+      }
+    }
+  }
+  sendFrame(records, n * sizeof(float));
+  free(records);
+}
+
+/**
+### Main Function
+
+Serves requests until standard input is closed. A request that cannot
+be parsed, whose snapshot cannot be restored, or whose grid cannot be
+allocated gets an empty frame, so the client never waits for a reply
+that will not come.
+*/
+int main(int a, char const *arguments[])
+{
+  list = list_add(list, D2c);
+  list = list_add(list, vel);
+
+  char line[2048], cmd;
+  double xmin, ymin, xmax, ymax;
+  int ny;
+  while (fgets(line, sizeof(line), stdin)) {
+    if (sscanf(line, " %c %1023s", &cmd, filename) != 2) {
+      sendFrame(NULL, 0);
+      continue;
+    }
+    if (cmd == 'F') {
+      if (loadSnapshot(filename))
+        sendFacets();
+      else
+        sendFrame(NULL, 0);
+    } else if (cmd == 'D' &&
+               sscanf(line, " %*c %*s %lf %lf %lf %lf %d",
+                      &xmin, &ymin, &xmax, &ymax, &ny) == 5) {
+      if (loadSnapshot(filename))
+        sendField(xmin, ymin, xmax, ymax, ny);
+      else
+        sendFrame(NULL, 0);
+    } else {
+      sendFrame(NULL, 0);
+    }
+  }
+
+  return 0;
+}
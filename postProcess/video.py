@@ -5,12 +5,14 @@
 
 import numpy as np
 import os
+import sys
 import subprocess as sp
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 from matplotlib.ticker import StrMethodFormatter
+from PIL import Image
 import multiprocessing as mp
 from functools import partial
 import argparse
@@ -19,133 +21,114 @@ import matplotlib.colors as mcolors
 custom_colors = ["white", "#DA8A67", "#A0522D", "#400000"]
 custom_cmap = mcolors.LinearSegmentedColormap.from_list("custom_hot", custom_colors)
 
-# Set up matplotlib configuration
-plt.rcParams['text.usetex'] = True
+# Set up matplotlib configuration; the labels are rendered with mathtext unless USE_LATEX=1
+# asks for a LaTeX run per text object, which is much slower to start and to draw
+USE_LATEX = os.environ.get('USE_LATEX', '0') == '1'
+plt.rcParams['text.usetex'] = USE_LATEX
 plt.rcParams['font.family'] = 'serif'
-plt.rcParams['text.latex.preamble'] = r'\usepackage{amsmath}\usepackage{amssymb}'
+if USE_LATEX:
+    plt.rcParams['text.latex.preamble'] = r'\usepackage{amsmath}\usepackage{amssymb}'
 plt.rcParams['mathtext.fontset'] = 'cm'
-plt.rcParams['font.serif'] = ['Computer Modern Roman'] + plt.rcParams['font.serif']
+if USE_LATEX:
+    plt.rcParams['font.serif'] = ['Computer Modern Roman'] + plt.rcParams['font.serif']
+else:
+    # cmr10 ships with matplotlib; it has no Unicode minus, so tick labels use mathtext for it
+    plt.rcParams['font.serif'] = ['cmr10'] + plt.rcParams['font.serif']
+    plt.rcParams['axes.formatter.use_mathtext'] = True
+
+# One getWorker process per pool process serves all of its snapshots
+worker = None
+
+def start_worker():
+    global worker
+    # stderr stays attached to the terminal so Basilisk errors are visible; replies come on stdout
+    worker = sp.Popen(["./getWorker"], stdin=sp.PIPE, stdout=sp.PIPE)
+
+def request(command):
+    # Send one request line and read back its frame: a native-endian uint64 size, then the payload
+    worker.stdin.write((command + "\n").encode("utf-8"))
+    worker.stdin.flush()
+    header = worker.stdout.read(8)
+    if len(header) < 8:
+        raise RuntimeError("getWorker exited unexpectedly; see its error output above")
+    return worker.stdout.read(int.from_bytes(header, sys.byteorder))
 
 def gettingFacets(filename):
-    exe = ["./getFacets", filename]
-    p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
-    stdout, stderr = p.communicate()
-    temp1 = stderr.decode("utf-8")
-    temp2 = temp1.split("\n")
+    facets = request(f"F {filename}")
+    temp1 = facets.decode("utf-8")
     segs = []
-    skip = False
-    if (len(temp2) > 1e2):
-        for n1 in range(len(temp2)):
-            temp3 = temp2[n1].split(" ")
-            if temp3 == ['']:
-                skip = False
-                pass
-            else:
-                if not skip:
-                    temp4 = temp2[n1+1].split(" ")
-                    r1, z1 = np.array([float(temp3[1]), float(temp3[0])])
-                    r2, z2 = np.array([float(temp4[1]), float(temp4[0])])
-                    segs.append(((r1, z1),(r2, z2)))
-                    segs.append(((-r1, z1),(-r2, z2)))
-                    skip = True
+    if (temp1.count("\n") + 1 > 1e2):
+        # Each facet is two "z r" lines followed by a blank line, so the values are (z1, r1, z2, r2) rows
+        pts = np.array(temp1.split(), dtype=float).reshape(-1, 2, 2)[:, :, ::-1]
+        mirrored = pts * np.array([-1.0, 1.0])
+        segs = np.stack([pts, mirrored], axis=1).reshape(-1, 2, 2)
     return segs
 
 def gettingfield(filename, zmin, rmin, zmax, rmax, nr):
-    exe = ["./getData", filename, str(zmin), str(rmin), str(zmax), str(rmax), str(nr)]
-    p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
-    stdout, stderr = p.communicate()
-    temp1 = stderr.decode("utf-8")
-    temp2 = temp1.split("\n")
-    # print(temp2) #debugging
-    Rtemp, Ztemp, D2temp, veltemp  = [],[],[],[]
-
-    for n1 in range(len(temp2)):
-        temp3 = temp2[n1].split(" ")
-        if temp3 == ['']:
-            pass
-        else:
-            Ztemp.append(float(temp3[0]))
-            Rtemp.append(float(temp3[1]))
-            D2temp.append(float(temp3[2]))
-            veltemp.append(float(temp3[3]))
-
+    # getWorker answers with (z, r, D2, vel) records of float32 as one binary block
+    payload = request(f"D {filename} {zmin} {rmin} {zmax} {rmax} {nr}")
+    if not payload:
+        raise RuntimeError(f"getWorker returned no field data for {filename}; see its error output above")
+    data = np.frombuffer(payload, dtype=np.float32).reshape(-1, 4)
 
-    R = np.asarray(Rtemp)
-    Z = np.asarray(Ztemp)
-    D2 = np.asarray(D2temp)
-    vel = np.asarray(veltemp)
+    nz = int(len(data)/nr)
 
-    nz = int(len(Z)/nr)
-
-    # print("nr is %d %d" % (nr, len(R))) # debugging
+    # print("nr is %d %d" % (nr, len(data))) # debugging
     print("nz is %d" % nz)
 
-    R.resize((nz, nr))
-    Z.resize((nz, nr))
-    D2.resize((nz, nr))
-    vel.resize((nz, nr))
+    # Views into the received block, one (nz, nr) grid per column; nothing is copied
+    grid = data[:nz*nr].reshape(nz, nr, 4)
+    Z, R, D2, vel = grid[:, :, 0], grid[:, :, 1], grid[:, :, 2], grid[:, :, 3]
 
     return R, Z, D2, vel, nz
 
 # ----------------------------------------------------------------------------------------------------------------------
 
-def process_timestep(ti, caseToProcess, folder, nGFS, GridsPerR, rmin, rmax, zmin, zmax, lw):
-    t = 0.01 * ti
-    place = f"{caseToProcess}/intermediate/snapshot-{t:.4f}"
-    name = f"{folder}/{int(t*1000):08d}.png"
-
-    if not os.path.exists(place):
-        print(f"{place} File not found!")
-        return
-
-    if os.path.exists(name):
-        print(f"{name} Image present!")
-        return
-
-    # --- Gather interface segments and field data as before ---
-    segs = gettingFacets(place)
-    nr = int(GridsPerR * rmax)
-    R, Z, D2, vel, nz = gettingfield(place, zmin, rmin, zmax, rmax, nr)
-
-
-    [xminp, xmaxp, yminp, ymaxp] = R.min(), R.max(), Z.min(), Z.max()
-    extent_vel = [-xminp, -xmaxp, yminp, ymaxp]
-    extent_D2 = [xminp, xmaxp, yminp, ymaxp]
+# The figure is built once per pool process and only its data is updated for each frame
+figure = None
 
+def build_figure(rmax, zmin, zmax, lw):
     AxesLabel, TickLabel = 30, 20
-    fig, ax = plt.subplots(1, 1, figsize=(19.20, 10.80))
-
-
-    ax.plot([-rmax, rmax], [0, 0], '--', color='grey', linewidth=lw)  # "horizontal" axis is z
-    ax.plot([0, 0], [zmin, zmax], '-.', color='grey', linewidth=lw)  # "vertical" axis is r
-
-    # Domain box:
-    ax.plot([-rmax, rmax], [zmin, zmin], '-', color='black', linewidth=lw)
-    ax.plot([-rmax, rmax], [zmax, zmax], '-', color='black', linewidth=lw)
-    ax.plot([-rmax, -rmax], [zmin, zmax], '-', color='black', linewidth=lw)
-    ax.plot([rmax, rmax], [zmin, zmax], '-', color='black', linewidth=lw)
+    # Frames are rasterized straight from the canvas, so it is drawn at the output DPI
+    fig, ax = plt.subplots(1, 1, figsize=(19.20, 10.80), dpi=150)
+
+
+    # Static lines in one collection: the z and r axes, then the domain box
+    static_lines = LineCollection(
+        [
+            [(-rmax, 0), (rmax, 0)],  # "horizontal" axis is z
+            [(0, zmin), (0, zmax)],  # "vertical" axis is r
+            [(-rmax, zmin), (rmax, zmin)],
+            [(-rmax, zmax), (rmax, zmax)],
+            [(-rmax, zmin), (-rmax, zmax)],
+            [(rmax, zmin), (rmax, zmax)],
+        ],
+        colors=['grey', 'grey', 'black', 'black', 'black', 'black'],
+        linestyles=['--', '-.', '-', '-', '-', '-'],
+        linewidths=lw,
+        capstyle='projecting'  # as Line2D draws solid lines, so the box corners close
+    )
+    ax.add_collection(static_lines)
 
-    line_segments = LineCollection(segs, linewidths=4, colors='green')
+    line_segments = LineCollection([], linewidths=4, colors='green')
     ax.add_collection(line_segments)
 
     # ----------------------------------------------------------
-    # Now show imshow with the rotated arrays and extents:
+    # imshow placeholders; each frame sets the rotated arrays and extents
     # ----------------------------------------------------------
     cntrl1 = ax.imshow(
-        vel, 
+        np.zeros((2, 2), dtype=np.float32), 
         cmap="Blues", 
         interpolation='bilinear', 
         origin='lower', 
-        extent=extent_vel,
         vmin=0.0,
         vmax=4e0
     )
     cntrl2 = ax.imshow(
-        D2, 
+        np.zeros((2, 2), dtype=np.float32), 
         cmap="hot_r", 
         interpolation='bilinear', 
         origin='lower', 
-        extent=extent_D2,
         vmin=-3e0,
         vmax=2e0
     )
@@ -155,9 +138,6 @@ def process_timestep(ti, caseToProcess, folder, nGFS, GridsPerR, rmin, rmax, zmi
     ax.set_xlim(-rmax, rmax)  # x range
     ax.set_ylim(zmin, zmax)  # y range
 
-    # Titles and labels that match the new orientation
-    ax.set_title(fr'$t/\tau_{{\gamma}} = {t:.4f}$', fontsize=TickLabel)
-
     # Colorbars: place them closer to the plot edges
     fig.subplots_adjust(left=0.1, right=0.9)  # adjust spacing for vertical colorbars
     
@@ -178,9 +158,69 @@ def process_timestep(ti, caseToProcess, folder, nGFS, GridsPerR, rmin, rmax, zmi
 
     ax.axis('off')
 
-    # Save with higher DPI and specific backend
-    plt.savefig(name, bbox_inches="tight", dpi=150, backend='agg')
-    plt.close()
+    return {'fig': fig, 'ax': ax, 'segments': line_segments, 'vel': cntrl1, 'D2': cntrl2, 'TickLabel': TickLabel}
+
+def frame_paths(ti, caseToProcess, folder):
+    t = 0.01 * ti
+    place = f"{caseToProcess}/intermediate/snapshot-{t:.4f}"
+    name = f"{folder}/{int(t*1000):08d}.png"
+    return t, place, name
+
+def needs_rendering(ti, caseToProcess, folder, force=False):
+    t, place, name = frame_paths(ti, caseToProcess, folder)
+
+    if not os.path.exists(place):
+        print(f"{place} File not found!")
+        return False
+
+    if not force and os.path.exists(name):
+        print(f"{name} Image present!")
+        return False
+
+    return True
+
+def process_timestep(ti, caseToProcess, folder, nGFS, GridsPerR, rmin, rmax, zmin, zmax, lw):
+    # Frames are checked with needs_rendering before they are dispatched
+    global figure
+    t, place, name = frame_paths(ti, caseToProcess, folder)
+
+    # --- Gather interface segments and field data as before ---
+    segs = gettingFacets(place)
+    nr = int(GridsPerR * rmax)
+    R, Z, D2, vel, nz = gettingfield(place, zmin, rmin, zmax, rmax, nr)
+
+
+    [xminp, xmaxp, yminp, ymaxp] = R.min(), R.max(), Z.min(), Z.max()
+    extent_vel = [-xminp, -xmaxp, yminp, ymaxp]
+    extent_D2 = [xminp, xmaxp, yminp, ymaxp]
+
+    if figure is None:
+        figure = build_figure(rmax, zmin, zmax, lw)
+
+    figure['segments'].set_segments(segs)
+    figure['vel'].set_data(vel)
+    figure['vel'].set_extent(extent_vel)
+    figure['D2'].set_data(D2)
+    figure['D2'].set_extent(extent_D2)
+
+    # Titles and labels that match the new orientation
+    figure['ax'].set_title(fr'$t/\tau_{{\gamma}} = {t:.4f}$', fontsize=figure['TickLabel'])
+
+    # The layout is the same for every frame, so the tight bounding box is measured
+    # once and turned into a pixel crop of the canvas (rows count from the top)
+    if 'crop' not in figure:
+        fig = figure['fig']
+        fig.canvas.draw()
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+        width, height = fig.canvas.get_width_height()
+        x0, x1 = max(0, int(round(bbox.x0*fig.dpi))), min(width, int(round(bbox.x1*fig.dpi)))
+        y0, y1 = max(0, int(round(bbox.y0*fig.dpi))), min(height, int(round(bbox.y1*fig.dpi)))
+        figure['crop'] = (slice(height - y1, height - y0), slice(x0, x1))
+
+    # Encode the rendered canvas with Pillow at the fastest zlib level, skipping savefig's re-render
+    figure['fig'].canvas.draw()
+    frame = np.asarray(figure['fig'].canvas.buffer_rgba())[figure['crop']]
+    Image.fromarray(frame).save(name, 'PNG', compress_level=1, optimize=False)
 
 def main():
     # Get number of CPUs from command line argument, or use all available
@@ -195,6 +235,7 @@ def main():
     parser.add_argument('--ZMIN', type=float, default=-3.0, help='Minimum Z value')
     parser.add_argument('--RMIN', type=float, default=0.0, help='Minimum R value')
     parser.add_argument('--caseToProcess', type=str, default='../testCases/burstingBubbleHB', help='Case to process')
+    parser.add_argument('--force', action='store_true', help='Re-render frames whose image already exists')
     
     args = parser.parse_args()
 
@@ -216,15 +257,36 @@ def main():
     if not os.path.isdir(folder):
         os.makedirs(folder)
 
+    # Only dispatch frames whose snapshot exists and whose image is still missing
+    todo = [ti for ti in range(nGFS) if needs_rendering(ti, caseToProcess, folder, args.force)]
+    if not todo:
+        return
+
+    # A failing pool initializer makes the pool respawn workers forever, so check the helper first
+    if not os.access("./getWorker", os.X_OK):
+        sys.exit("Error: ./getWorker not found or not executable; compile it first with: qcc -O2 -Wall getWorker.c -o getWorker -lm")
+
+    # Build and draw the figure once here: forked workers inherit it with the font and
+    # mathtext caches already warm, instead of each paying for the first draw
+    global figure
+    figure = build_figure(rmax, zmin, zmax, lw)
+    figure['ax'].set_title(fr'$t/\tau_{{\gamma}} = {0:.4f}$', fontsize=figure['TickLabel'])
+    figure['fig'].canvas.draw()
+    # Fork only on Linux; macOS defaults to spawn because forking after framework initialization is
+    # unsafe there, and spawned workers build their own figure on their first frame
+    context = mp.get_context('fork') if sys.platform.startswith('linux') else mp.get_context()
+
     # Create a pool of worker processes
-    with mp.Pool(processes=num_processes) as pool:
+    with context.Pool(processes=num_processes, initializer=start_worker) as pool:
         # Create partial function with fixed arguments
         process_func = partial(process_timestep, caseToProcess=caseToProcess, 
                              folder=folder, nGFS=nGFS,
                              GridsPerR=GridsPerR, rmin=rmin, rmax=rmax, 
                              zmin=zmin, zmax=zmax, lw=lw)
-        # Map the process_func to all timesteps
-        pool.map(process_func, range(nGFS))
+        # Map the process_func to all timesteps, a few frames per task; results are not needed, so take them as they finish
+        chunk = max(1, len(todo) // (num_processes * 4))
+        for _ in pool.imap_unordered(process_func, todo, chunksize=chunk):
+            pass
 
 if __name__ == "__main__":
     main()